@@ -1,9 +1,42 @@
 from supabase import create_client, Client
 from typing import List, Optional
 import logging
+import math
 from config import Config
 from models import Restaurant
 
+# Values per IN filter when checking restaurants in bulk (keeps request URLs short)
+EXISTENCE_CHECK_BATCH_SIZE = 100
+
+# Characters that make postgrest-py's in_() wrap a value in double quotes (postgrest.utils.sanitize_param)
+IN_FILTER_RESERVED_CHARS = ",:()"
+
+def _escape_in_values(values) -> List[str]:
+    """Escape backslashes and double quotes in values in_() will quote, so names like 'Bar "X", Y' stay one value"""
+    escaped = []
+    for value in values:
+        text = str(value)
+        if any(char in text for char in IN_FILTER_RESERVED_CHARS):
+            text = text.replace('\\', '\\\\').replace('"', '\\"')
+        escaped.append(text)
+    return escaped
+
+# Rows per page when reading through PostgREST (its default response cap)
+READ_PAGE_SIZE = 1000
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+# Rows per insert request (PostgREST handles ~1000 rows per request well; larger payloads gain nothing)
+INSERT_BATCH_SIZE = 1000
+
 class DatabaseManager:
     def __init__(self):
         self.supabase: Optional[Client] = None
@@ -127,6 +160,62 @@ class DatabaseManager:
             self.logger.error(f"Error checking restaurant existence: {e}")
             return False
     
+    def check_restaurants_exist(self, restaurants: List[Restaurant]) -> List[bool]:
+        """Check which restaurants already exist, same rules as check_restaurant_exists
+        
+        Coordinates and names are looked up with batched IN filters, so the whole
+        list costs a handful of requests instead of one or two per restaurant. A
+        batch whose lookup fails is re-checked one restaurant at a time.
+        """
+        if not self.supabase or not restaurants:
+            return [False] * len(restaurants)
+        
+        exists = []
+        for i in range(0, len(restaurants), EXISTENCE_CHECK_BATCH_SIZE):
+            batch = restaurants[i:i + EXISTENCE_CHECK_BATCH_SIZE]
+            try:
+                exists.extend(self._check_restaurant_batch_exists(batch))
+            except Exception as e:
+                self.logger.warning(f"Batched existence check failed, checking {len(batch)} restaurants individually: {e}")
+                exists.extend(
+                    self.check_restaurant_exists(r.name, r.address, r.latitude, r.longitude) for r in batch
+                )
+        return exists
+    
+    def _check_restaurant_batch_exists(self, restaurants: List[Restaurant]) -> List[bool]:
+        """One coordinate and one name IN lookup for up to EXISTENCE_CHECK_BATCH_SIZE restaurants"""
+        # Coordinates are stored as DECIMAL(.., 8); compare at that precision
+        coords = {
+            (round(r.latitude, 8), round(r.longitude, 8))
+            for r in restaurants if r.latitude is not None and r.longitude is not None
+        }
+        existing_coords = set()
+        if coords:
+            latitudes = sorted({lat for lat, _ in coords})
+            result = self.supabase.table('restaurants').select('latitude,longitude').in_('latitude', latitudes).execute()
+            existing_coords.update(
+                (round(float(row['latitude']), 8), round(float(row['longitude']), 8))
+                for row in result.data if row['latitude'] is not None and row['longitude'] is not None
+            )
+        
+        # Fallback to name and address check
+        addresses_by_name = {}
+        names = sorted({r.name for r in restaurants})
+        result = self.supabase.table('restaurants').select('name,address').in_('name', _escape_in_values(names)).execute()
+        for row in result.data:
+            addresses_by_name.setdefault(row['name'], set()).add(row['address'])
+        
+        exists = []
+        for r in restaurants:
+            if r.latitude is not None and r.longitude is not None and \
+                    (round(r.latitude, 8), round(r.longitude, 8)) in existing_coords:
+                exists.append(True)
+            elif r.name in addresses_by_name:
+                exists.append(not r.address or r.address in addresses_by_name[r.name])
+            else:
+                exists.append(False)
+        return exists
+    
     def insert_restaurants(self, restaurants: List[Restaurant], skip_duplicates: bool = True) -> tuple:
         """Insert restaurants into Supabase database with duplicate detection
         
@@ -142,15 +231,12 @@ class DatabaseManager:
             skipped_count = 0
             restaurant_data = []
             
-            for restaurant in restaurants:
-                # Check for duplicates if skip_duplicates is True
-                if skip_duplicates and self.check_restaurant_exists(
-                    restaurant.name, 
-                    restaurant.address, 
-                    restaurant.latitude, 
-                    restaurant.longitude
-                ):
-                    self.logger.info(f"Skipping duplicate: {restaurant.name} at ({restaurant.latitude}, {restaurant.longitude})")
+            # Check for duplicates if skip_duplicates is True (one batched lookup for the whole list)
+            existing = self.check_restaurants_exist(restaurants) if skip_duplicates else [False] * len(restaurants)
+            
+            for restaurant, exists in zip(restaurants, existing):
+                if exists:
+                    self.logger.info("Skipping duplicate: %s at (%s, %s)", restaurant.name, restaurant.latitude, restaurant.longitude)
                     skipped_count += 1
                     continue
                 
@@ -163,29 +249,60 @@ class DatabaseManager:
                 self.logger.info("No new restaurants to insert (all were duplicates)")
                 return True, 0, skipped_count
             
-            # Insert into database
-            try:
-                result = self.supabase.table('restaurants').insert(restaurant_data).execute()
+            # Insert into database, one request per INSERT_BATCH_SIZE rows
+            failed_count = 0
+            for start in range(0, len(restaurant_data), INSERT_BATCH_SIZE):
+                batch = restaurant_data[start:start + INSERT_BATCH_SIZE]
+                try:
+                    result = self.supabase.table('restaurants').insert(batch).execute()
+                    
+                    if result.data:
+                        inserted_count += len(result.data)
+                    else:
+                        self.logger.error("Failed to insert restaurants")
+                        return False, inserted_count, skipped_count
+                except Exception as e:
+                    # One bad row (e.g. a location-based duplicate) rejects the whole batch; retry row by row
+                    self.logger.warning(f"Batch insert of {len(batch)} rows failed, retrying row by row: {e}")
+                    inserted, skipped, failed = self._insert_rows_individually(batch)
+                    inserted_count += inserted
+                    skipped_count += skipped + failed
+                    failed_count += failed
+            
+            if failed_count:
+                self.logger.error(f"Inserted {inserted_count} restaurants, {failed_count} rows failed, skipped {skipped_count} in total")
+                return False, inserted_count, skipped_count
+            
+            self.logger.info(f"Successfully inserted {inserted_count} restaurants, skipped {skipped_count} duplicates")
+            return True, inserted_count, skipped_count
                 
+        except Exception as e:
+            self.logger.error(f"Error inserting restaurants: {e}")
+            return False, 0, skipped_count
+    
+    def _insert_rows_individually(self, rows: List[dict]) -> tuple:
+        """Insert rows one request at a time
+        
+        Returns:
+            tuple: (inserted_count: int, duplicate_count: int, failed_count: int)
+        """
+        inserted_count = duplicate_count = failed_count = 0
+        for row in rows:
+            try:
+                result = self.supabase.table('restaurants').insert(row).execute()
                 if result.data:
-                    inserted_count = len(result.data)
-                    self.logger.info(f"Successfully inserted {inserted_count} restaurants, skipped {skipped_count} duplicates")
-                    return True, inserted_count, skipped_count
+                    inserted_count += 1
                 else:
-                    self.logger.error("Failed to insert restaurants")
-                    return False, 0, skipped_count
+                    failed_count += 1
             except Exception as e:
                 # Handle unique constraint violations (location-based duplicates)
                 if "duplicate key value violates unique constraint" in str(e).lower():
-                    self.logger.warning(f"Duplicate restaurant locations detected, skipping insertion: {e}")
-                    return True, 0, len(restaurant_data)  # All were duplicates
+                    self.logger.info("Skipping duplicate location: %s at (%s, %s)", row.get('name'), row.get('latitude'), row.get('longitude'))
+                    duplicate_count += 1
                 else:
-                    self.logger.error(f"Database insertion error: {e}")
-                    return False, 0, skipped_count
-                
-        except Exception as e:
-            self.logger.error(f"Error inserting restaurants: {e}")
-            return False, 0, skipped_count
+                    self.logger.error("Failed to insert %s: %s", row.get('name'), e)
+                    failed_count += 1
+        return inserted_count, duplicate_count, failed_count
     
     def get_restaurants(self, limit: int = 100, offset: int = 0) -> List[dict]:
         """Get restaurants from database"""
@@ -329,6 +446,16 @@ class DatabaseManager:
             self.logger.error("No Supabase connection available")
             return []
         
+        try:
+            # Indexed full-text search (search_restaurants_fts in database/setup_fresh_database.sql)
+            result = self.supabase.rpc('search_restaurants_fts', {'q': query, 'lim': limit}).execute()
+            if result.data:
+                return result.data
+            # Stemmed word matching misses partial names (e.g. "veg" in "Vegetarian"); try a substring match
+            self.logger.debug(f"No full-text matches for {query!r}, falling back to name match")
+        except Exception as e:
+            self.logger.warning(f"Full-text search unavailable, falling back to name match: {e}")
+        
         try:
             result = self.supabase.table('restaurants').select('*').ilike('name', f'%{query}%').limit(limit).execute()
             return result.data if result.data else []
@@ -349,32 +476,55 @@ class DatabaseManager:
             self.logger.error(f"Error getting vegan restaurants: {e}")
             return []
     
-    def get_restaurants_by_location(self, lat: float, lng: float, radius_km: float = 5.0) -> List[dict]:
-        """Get restaurants within a radius of given coordinates"""
+    def get_restaurants_by_location(self, lat: float, lng: float, radius_km: float = 5.0, limit: int = 100) -> List[dict]:
+        """Get restaurants within a radius of given coordinates, nearest first"""
         if not self.supabase:
             self.logger.error("No Supabase connection available")
             return []
         
         try:
-            # Use PostGIS function for distance calculation
+            # restaurants_within() (database/setup_postgis.sql) runs ST_DWithin against a
+            # GiST index, so only nearby candidates get an exact distance check.
             # This requires the PostGIS extension to be enabled in Supabase
-            sql = f"""
-            SELECT *, 
-                   ST_Distance(
-                       ST_Point(longitude, latitude)::geography,
-                       ST_Point({lng}, {lat})::geography
-                   ) / 1000 as distance_km
-            FROM restaurants 
-            WHERE ST_DWithin(
-                ST_Point(longitude, latitude)::geography,
-                ST_Point({lng}, {lat})::geography,
-                {radius_km * 1000}
-            )
-            ORDER BY distance_km
-            """
-            
-            result = self.supabase.rpc('exec_sql', {'sql': sql})
+            result = self.supabase.rpc('restaurants_within', {
+                'lat': lat,
+                'lng': lng,
+                'radius_m': radius_km * 1000,
+                'max_results': limit
+            }).execute()
             return result.data if result.data else []
+        except Exception as e:
+            self.logger.warning(f"Radius search RPC unavailable, falling back to bounding box: {e}")
+            return self._get_restaurants_in_bounding_box(lat, lng, radius_km, limit)
+    
+    def _get_restaurants_in_bounding_box(self, lat: float, lng: float, radius_km: float, limit: int) -> List[dict]:
+        """Radius search without PostGIS: B-tree bounding-box prefilter, exact distance in Python"""
+        try:
+            # The (latitude, longitude) unique constraint's index serves the box; only its rows are fetched
+            dlat = radius_km / 111.0
+            dlng = radius_km / (111.0 * max(math.cos(math.radians(lat)), 1e-6))
+            candidates = []
+            offset = 0
+            while True:
+                result = (
+                    self.supabase.table('restaurants').select('*')
+                    .gte('latitude', lat - dlat).lte('latitude', lat + dlat)
+                    .gte('longitude', lng - dlng).lte('longitude', lng + dlng)
+                    .order('id').range(offset, offset + READ_PAGE_SIZE - 1).execute()
+                )
+                rows = result.data or []
+                candidates.extend(rows)
+                if len(rows) < READ_PAGE_SIZE:
+                    break
+                offset += len(rows)
+            
+            nearby = []
+            for row in candidates:
+                distance_km = haversine_km(lat, lng, float(row['latitude']), float(row['longitude']))
+                if distance_km <= radius_km:
+                    nearby.append({**row, 'distance_km': distance_km})
+            nearby.sort(key=lambda row: row['distance_km'])
+            return nearby[:limit]
         except Exception as e:
             self.logger.error(f"Error getting restaurants by location: {e}")
             return []
@@ -43,16 +43,16 @@ def check_restaurants_table():
         
         # Get total count of restaurants
         logger.info("\n📊 Getting restaurant statistics...")
-        total_result = db_manager.supabase.table('restaurants').select('id', count='exact').execute()
-        total_count = total_result.count if hasattr(total_result, 'count') else len(total_result.data)
+        total_result = db_manager.supabase.table('restaurants').select('id', count='exact').limit(1).execute()
+        total_count = total_result.count or 0
         
         # Get count of restaurants with coordinates
-        coord_result = db_manager.supabase.table('restaurants').select('id', count='exact').not_.is_('latitude', 'null').not_.is_('longitude', 'null').execute()
-        coord_count = coord_result.count if hasattr(coord_result, 'count') else len(coord_result.data)
+        coord_result = db_manager.supabase.table('restaurants').select('id', count='exact').not_.is_('latitude', 'null').not_.is_('longitude', 'null').limit(1).execute()
+        coord_count = coord_result.count or 0
         
         # Get count of restaurants without coordinates
-        no_coord_result = db_manager.supabase.table('restaurants').select('id', count='exact').is_('latitude', 'null').execute()
-        no_coord_count = no_coord_result.count if hasattr(no_coord_result, 'count') else len(no_coord_result.data)
+        no_coord_result = db_manager.supabase.table('restaurants').select('id', count='exact').is_('latitude', 'null').limit(1).execute()
+        no_coord_count = no_coord_result.count or 0
         
         # Display statistics
         print("\n" + "="*60)
@@ -90,16 +90,16 @@ def check_restaurants_table():
         print(f"\n📊 Restaurant type breakdown:")
         
         # Vegan restaurants
-        vegan_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('is_vegan', True).execute()
-        vegan_count = vegan_result.count if hasattr(vegan_result, 'count') else len(vegan_result.data)
+        vegan_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('is_vegan', True).limit(1).execute()
+        vegan_count = vegan_result.count or 0
         
         # Vegetarian restaurants
-        vegetarian_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('is_vegetarian', True).execute()
-        vegetarian_count = vegetarian_result.count if hasattr(vegetarian_result, 'count') else len(vegetarian_result.data)
+        vegetarian_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('is_vegetarian', True).limit(1).execute()
+        vegetarian_count = vegetarian_result.count or 0
         
         # Restaurants with veg options
-        veg_options_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('has_veg_options', True).execute()
-        veg_options_count = veg_options_result.count if hasattr(veg_options_result, 'count') else len(veg_options_result.data)
+        veg_options_result = db_manager.supabase.table('restaurants').select('id', count='exact').eq('has_veg_options', True).limit(1).execute()
+        veg_options_count = veg_options_result.count or 0
         
         print(f"  🌱 Vegan restaurants: {vegan_count}")
         print(f"  🥗 Vegetarian restaurants: {vegetarian_count}")
@@ -49,6 +49,28 @@ CREATE INDEX IF NOT EXISTS idx_restaurants_longitude ON restaurants(longitude);
 -- This is more reliable than name-based constraints
 ALTER TABLE restaurants ADD CONSTRAINT unique_restaurant_location UNIQUE (latitude, longitude);
 
+-- =====================================================
+-- Full-text search
+-- =====================================================
+-- GIN index over name/description/category lexemes; the function repeats the
+-- exact expression so the planner can use it (ILIKE '%term%' never can)
+CREATE INDEX IF NOT EXISTS idx_restaurants_search ON restaurants
+    USING GIN (to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(category, '')));
+
+CREATE OR REPLACE FUNCTION search_restaurants_fts(q TEXT, lim INTEGER DEFAULT 100)
+RETURNS SETOF restaurants
+LANGUAGE SQL STABLE
+AS $$
+    SELECT r.*
+    FROM restaurants r
+    WHERE to_tsvector('english', coalesce(r.name, '') || ' ' || coalesce(r.description, '') || ' ' || coalesce(r.category, ''))
+          @@ plainto_tsquery('english', q)
+    ORDER BY ts_rank(
+        to_tsvector('english', coalesce(r.name, '') || ' ' || coalesce(r.description, '') || ' ' || coalesce(r.category, '')),
+        plainto_tsquery('english', q)) DESC
+    LIMIT lim;
+$$;
+
 -- Create scraping_progress table
 CREATE TABLE scraping_progress (
     id SERIAL PRIMARY KEY,
@@ -0,0 +1,32 @@
+-- =====================================================
+-- Optional: PostGIS radius search for HappyCow Singapore Scraper
+-- =====================================================
+-- Run after setup_fresh_database.sql on databases where the postgis extension
+-- is available. Without it, DatabaseManager.get_restaurants_by_location falls
+-- back to a bounding-box query, so the core setup does not depend on this file.
+
+-- ST_DWithin over this expression index only computes exact distances for
+-- rows whose bounding boxes overlap the search circle
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+CREATE INDEX IF NOT EXISTS idx_restaurants_geog ON restaurants
+    USING GIST ((ST_SetSRID(ST_MakePoint(longitude::float8, latitude::float8), 4326)::geography));
+
+-- Restaurants within radius_m metres, nearest first (the <-> KNN operator is also index-driven)
+CREATE OR REPLACE FUNCTION restaurants_within(lat DOUBLE PRECISION, lng DOUBLE PRECISION,
+                                              radius_m DOUBLE PRECISION, max_results INTEGER DEFAULT 100)
+RETURNS SETOF JSONB
+LANGUAGE SQL STABLE
+AS $$
+    SELECT to_jsonb(r) || jsonb_build_object('distance_km', ST_Distance(
+               ST_SetSRID(ST_MakePoint(r.longitude::float8, r.latitude::float8), 4326)::geography,
+               ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography) / 1000)
+    FROM restaurants r
+    WHERE ST_DWithin(
+        ST_SetSRID(ST_MakePoint(r.longitude::float8, r.latitude::float8), 4326)::geography,
+        ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography,
+        radius_m)
+    ORDER BY ST_SetSRID(ST_MakePoint(r.longitude::float8, r.latitude::float8), 4326)::geography
+          <-> ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography
+    LIMIT max_results;
+$$;
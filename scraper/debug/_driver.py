@@ -0,0 +1,39 @@
+"""
+Shared WebDriver for debug scripts
+Launches Chrome once per process and hands the same session to every debug run
+"""
+
+import os
+import sys
+import atexit
+from typing import Optional
+
+# Add the scraper directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sectorscraper import HappyCowPageLoader
+
+_shared_loader: Optional[HappyCowPageLoader] = None
+
+
+def get_shared_loader(headless: bool = False, fresh: bool = False) -> HappyCowPageLoader:
+    """Get the process-wide page loader, creating it on first use (or replacing it when fresh)
+
+    A reused loader keeps its Chrome but gets a clean cookie jar.
+    """
+    global _shared_loader
+    if fresh and _shared_loader is not None:
+        _shared_loader.close_driver()
+        _shared_loader = None
+    if _shared_loader is None:
+        _shared_loader = HappyCowPageLoader(headless=headless)
+        atexit.register(_shared_loader.close_driver)
+    elif _shared_loader.driver:
+        _shared_loader.driver.delete_all_cookies()
+    return _shared_loader
+
+
+def close_shared_driver():
+    """Close the shared driver now (atexit does not run in pool worker processes)"""
+    if _shared_loader is not None:
+        _shared_loader.close_driver()
@@ -6,21 +6,36 @@ Investigates what data is available on the searchmap page
 import sys
 import os
 import logging
-import time
+import argparse
+import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 
 # Add the scraper directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from sectorscraper import SingaporeSectorGrid, HappyCowURLGenerator, HappyCowPageLoader, HappyCowDataExtractor
+from sectorscraper import SingaporeSectorGrid, HappyCowURLGenerator, HappyCowDataExtractor
+from sectorscraper.page_loader import USER_AGENT
+from _driver import get_shared_loader
+
+# Restaurant-related keywords counted in the page source
+KEYWORDS = ['restaurant', 'cafe', 'food', 'vegan', 'vegetarian', 'marker', 'venue']
+
+# Page source length and case-insensitive keyword counts, computed in the browser (one pass)
+KEYWORD_COUNT_JS = """
+const html = document.documentElement.outerHTML;
+const counts = Object.fromEntries(arguments[0].map(k => [k, 0]));
+const pattern = new RegExp(arguments[0].join('|'), 'gi');
+for (const m of html.matchAll(pattern)) counts[m[0].toLowerCase()]++;
+return {length: html.length, counts: counts};
+"""
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def debug_searchmap():
+def debug_searchmap(fresh: bool = False):
     """Debug the searchmap page to see what data is available"""
     logger.info("🔍 Debugging HappyCow SearchMap page...")
     
@@ -37,8 +52,19 @@ def debug_searchmap():
     print(f"Center coordinates: ({test_sector['lat_center']}, {test_sector['lng_center']})")
     print(f"URL: {test_url}")
     
-    # Load the page
-    loader = HappyCowPageLoader(headless=False)  # Run in non-headless mode for visual debugging
+    # Check whether the cards are server-rendered (answerable without a browser)
+    print("\n🔍 Static HTML Check:")
+    try:
+        response = requests.get(test_url, headers={'User-Agent': USER_AGENT}, timeout=15)
+        static_restaurants = HappyCowDataExtractor(None).extract_restaurants_from_html(response.content)
+        print(f"HTTP {response.status_code}: {len(static_restaurants)} restaurants in server-rendered HTML")
+    except requests.exceptions.RequestException as e:
+        print(f"Static fetch failed: {e}")
+    
+    # Load the page (shared browser session, closed at interpreter exit)
+    loader = get_shared_loader(headless=False, fresh=fresh)  # Run in non-headless mode for visual debugging
+    if loader.driver:
+        loader.driver.delete_all_cookies()
     
     try:
         if loader.load_sector_page(test_url):
@@ -46,8 +72,13 @@ def debug_searchmap():
             
             driver = loader.driver
             
-            # Wait a bit for content to load
-            time.sleep(5)
+            # Wait until coordinate attributes are populated
+            if not loader.wait_for_coordinates():
+                print("⚠️ Coordinate attributes did not appear before timeout")
+            
+            # Let late-rendering cards finish before counting anything
+            if not loader.wait_for_dom_idle():
+                print("⚠️ Page was still changing when the settle timeout hit")
             
             print("\n🔍 Page Analysis:")
             print("=" * 50)
@@ -56,8 +87,8 @@ def debug_searchmap():
             print(f"Page title: {driver.title}")
             
             # 2. Check for markers
-            markers = driver.find_elements(By.CSS_SELECTOR, ".leaflet-marker-icon")
-            print(f"Markers found: {len(markers)}")
+            marker_count = loader.get_marker_count()
+            print(f"Markers found: {marker_count}")
             
             # 3. Check for results count
             results_count = loader.get_results_count()
@@ -68,14 +99,14 @@ def debug_searchmap():
             print(f"Has errors: {has_errors}")
             
             # 5. Check page source for restaurant data
-            page_source = driver.page_source
-            print(f"Page source length: {len(page_source)} characters")
+            # Counted in the browser so the serialized DOM never crosses the wire
+            source_stats = driver.execute_script(KEYWORD_COUNT_JS, KEYWORDS)
+            print(f"Page source length: {source_stats['length']} characters")
             
             # Look for restaurant-related keywords
-            keywords = ['restaurant', 'cafe', 'food', 'vegan', 'vegetarian', 'marker', 'venue']
-            for keyword in keywords:
-                count = page_source.lower().count(keyword)
-                print(f"'{keyword}' appears {count} times in page source")
+            keyword_counts = source_stats['counts']
+            for keyword in KEYWORDS:
+                print(f"'{keyword}' appears {keyword_counts[keyword]} times in page source")
             
             # 6. Check for JavaScript variables
             print("\n🔍 JavaScript Variables:")
@@ -87,17 +118,24 @@ def debug_searchmap():
                 'window.venues'
             ]
             
-            for var in js_vars:
-                try:
-                    result = driver.execute_script(f"return {var};")
-                    if result:
-                        print(f"  {var}: Found (Type: {type(result)}, Length: {len(result) if isinstance(result, (list, dict)) else 'N/A'})")
-                        if isinstance(result, (list, dict)) and len(str(result)) < 500:
-                            print(f"    Content: {result}")
-                    else:
-                        print(f"  {var}: Not found")
-                except Exception as e:
-                    print(f"  {var}: Error - {e}")
+            # Read every variable in one round-trip; unreadable globals come back as null
+            try:
+                js_values = driver.execute_script("""
+                    return arguments[0].map(name => {
+                        try { return window[name.split('.')[1]]; } catch (e) { return null; }
+                    });
+                """, js_vars)
+            except Exception as e:
+                print(f"  Error reading JavaScript variables - {e}")
+                js_values = [None] * len(js_vars)
+            
+            for var, result in zip(js_vars, js_values):
+                if result:
+                    print(f"  {var}: Found (Type: {type(result)}, Length: {len(result) if isinstance(result, (list, dict)) else 'N/A'})")
+                    if isinstance(result, (list, dict)) and len(str(result)) < 500:
+                        print(f"    Content: {result}")
+                else:
+                    print(f"  {var}: Not found")
             
             # 7. Check for specific elements
             print("\n🔍 DOM Elements:")
@@ -112,18 +150,29 @@ def debug_searchmap():
                 '.marker-popup'
             ]
             
-            for selector in selectors:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"  '{selector}': {len(elements)} elements")
+            # Count matches and dump attributes of small result sets in one round-trip
+            element_info = driver.execute_script("""
+                return arguments[0].map(sel => {
+                    const els = Array.from(document.querySelectorAll(sel));
+                    const attrs = els.length <= 3 ? els.map(e => {
+                        const o = {};
+                        for (const a of e.attributes) o[a.name] = a.value;
+                        return o;
+                    }) : [];
+                    return [els.length, attrs];
+                });
+            """, selectors)
+            
+            for selector, (count, attr_dumps) in zip(selectors, element_info):
+                print(f"  '{selector}': {count} elements")
                 
                 # Show attributes of first few elements
-                if elements and len(elements) <= 3:
-                    for i, el in enumerate(elements):
-                        print(f"    Element {i+1}:")
-                        for attr in ['data-lat', 'data-lng', 'title', 'alt', 'class']:
-                            value = el.get_attribute(attr)
-                            if value:
-                                print(f"      {attr}: {value[:50]}...")
+                for i, attrs in enumerate(attr_dumps):
+                    print(f"    Element {i+1}:")
+                    for attr in ['data-lat', 'data-lng', 'title', 'alt', 'class']:
+                        value = attrs.get(attr)
+                        if value:
+                            print(f"      {attr}: {value[:50]}...")
             
             # 8. Try to extract data using the extractor
             print("\n🔍 Data Extraction Test:")
@@ -141,18 +190,24 @@ def debug_searchmap():
             print("\n🔍 Interaction Test:")
             try:
                 # Try clicking on a marker if any exist
-                if markers:
+                first_marker = driver.execute_script("return document.querySelector('.leaflet-marker-icon');")
+                if first_marker:
                     print(f"Attempting to click on first marker...")
-                    markers[0].click()
-                    time.sleep(2)
+                    first_marker.click()
                     
-                    # Check for popup
-                    popups = driver.find_elements(By.CSS_SELECTOR, ".leaflet-popup")
+                    # Wait for the popup instead of sleeping a fixed interval
+                    try:
+                        popups = WebDriverWait(driver, 5, poll_frequency=0.25).until(
+                            lambda d: d.find_elements(By.CSS_SELECTOR, ".leaflet-popup")
+                        )
+                    except TimeoutException:
+                        popups = []
                     print(f"Popups after click: {len(popups)}")
                     
                     if popups:
-                        popup_content = popups[0].text
-                        print(f"Popup content: {popup_content[:200]}...")
+                        # Slice in the browser so only the printed prefix crosses the wire
+                        popup_content = driver.execute_script("return arguments[0].innerText.slice(0, 200);", popups[0])
+                        print(f"Popup content: {popup_content}...")
             except Exception as e:
                 print(f"Interaction test failed: {e}")
             
@@ -161,8 +216,9 @@ def debug_searchmap():
             
     except Exception as e:
         logger.error(f"Error during debugging: {e}")
-    finally:
-        loader.close_driver()
 
 if __name__ == "__main__":
-    debug_searchmap()
+    parser = argparse.ArgumentParser(description='Debug the HappyCow searchmap page')
+    parser.add_argument('--fresh', action='store_true', help='Start a new Chrome session instead of reusing the shared one')
+    args = parser.parse_args()
+    debug_searchmap(fresh=args.fresh)
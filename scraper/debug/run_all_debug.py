@@ -0,0 +1,61 @@
+"""
+Runs every debug_*.py script in this folder in parallel
+Each script runs in its own worker process with its own Chrome session
+"""
+
+import os
+import sys
+import glob
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+
+DEBUG_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DEBUG_DIR)
+
+
+def _run_script(path: str):
+    """Run one debug script as __main__ inside a worker process"""
+    from _driver import close_shared_driver
+    
+    try:
+        runpy.run_path(path, run_name='__main__')
+        return True, None
+    except SystemExit as e:
+        return e.code in (None, 0), None if e.code in (None, 0) else f"exited with {e.code}"
+    except Exception as e:
+        return False, str(e)
+    finally:
+        # WebDriver is not thread-safe and workers skip atexit, so each process cleans up its own browser
+        close_shared_driver()
+
+
+def run_all_debug(max_workers: int = None):
+    """Run all debug scripts concurrently and print a summary"""
+    scripts = sorted(glob.glob(os.path.join(DEBUG_DIR, 'debug_*.py')))
+    if not scripts:
+        print("No debug scripts found")
+        return True
+    
+    workers = max_workers or min(4, os.cpu_count() or 1, len(scripts))
+    print(f"🚀 Running {len(scripts)} debug scripts with {workers} workers")
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_run_script, scripts))
+    
+    print("\n" + "=" * 50)
+    print("DEBUG RUN SUMMARY")
+    print("=" * 50)
+    all_ok = True
+    for path, (ok, error) in zip(scripts, results):
+        name = os.path.basename(path)
+        if ok:
+            print(f"  ✅ {name}")
+        else:
+            all_ok = False
+            print(f"  ❌ {name}: {error}")
+    
+    return all_ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_debug() else 1)
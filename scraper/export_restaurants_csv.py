@@ -10,6 +10,9 @@ from supabase import create_client, Client
 # Load environment variables
 load_dotenv()
 
+# Rows per request; Supabase caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
 def export_restaurants_to_csv():
     """Export all restaurants from Supabase to a CSV file."""
     
@@ -25,31 +28,33 @@ def export_restaurants_to_csv():
     
     print("Fetching restaurants from Supabase...")
     
-    # Fetch all restaurants (handle pagination if needed)
-    response = supabase.table("restaurants").select("*").execute()
-    restaurants = response.data
+    # Page through the table in id order and stream each page to the file,
+    # so memory stays at one page and the server's row cap is never hit
+    def fetch_page(offset):
+        return supabase.table("restaurants").select("*").order("id").range(offset, offset + PAGE_SIZE - 1).execute().data
     
-    if not restaurants:
+    rows = fetch_page(0)
+    if not rows:
         print("No restaurants found in the database.")
         return
     
-    print(f"Found {len(restaurants)} restaurants. Exporting to CSV...")
-    
     # Get all column names from the first restaurant
-    if restaurants:
-        fieldnames = list(restaurants[0].keys())
-        
-        # Write to CSV file
-        output_file = "restaurants_export.csv"
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(restaurants)
-        
-        print(f"✅ Successfully exported {len(restaurants)} restaurants to '{output_file}'")
-        print(f"📁 File location: {os.path.abspath(output_file)}")
-    else:
-        print("No data to export.")
+    fieldnames = list(rows[0].keys())
+    
+    # Write to CSV file
+    output_file = "restaurants_export.csv"
+    exported = 0
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        while rows:
+            writer.writerows(rows)
+            exported += len(rows)
+            print(f"  Exported {exported} restaurants...")
+            rows = fetch_page(exported)
+    
+    print(f"✅ Successfully exported {exported} restaurants to '{output_file}'")
+    print(f"📁 File location: {os.path.abspath(output_file)}")
 
 if __name__ == "__main__":
     try:
@@ -21,6 +21,8 @@ DOWNLOAD_TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds between retries
 BATCH_SIZE = 10  # Process images in batches
+IMAGE_WORKERS = 4  # Images of one restaurant downloaded/uploaded in parallel
+DOWNLOAD_INTERVAL = 0.5  # Minimum seconds between download starts, shared by all workers
 
 # Storage Configuration
 STORAGE_FOLDER = "restaurants"  # Folder in Supabase Storage
@@ -28,3 +30,4 @@ BACKUP_ORIGINAL_URLS = True  # Keep original URLs in a backup field
 
 # Progress Tracking
 PROGRESS_FILE = "image_download_progress.json"
+PROGRESS_SNAPSHOT_EVERY = 50  # Restaurant updates appended to the .log between full JSON snapshots
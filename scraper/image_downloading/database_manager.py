@@ -131,13 +131,13 @@ class DatabaseManager:
         """
         try:
             # Count restaurants with images
-            with_images = self.supabase.table('restaurants').select('id', count='exact').not_.is_('images_links', 'null').execute()
+            with_images = self.supabase.table('restaurants').select('id', count='exact').not_.is_('images_links', 'null').limit(1).execute()
             
             # Count restaurants with original URLs backed up
-            with_backup = self.supabase.table('restaurants').select('id', count='exact').not_.is_('original_image_urls', 'null').execute()
+            with_backup = self.supabase.table('restaurants').select('id', count='exact').not_.is_('original_image_urls', 'null').limit(1).execute()
             
             # Count total restaurants
-            total = self.supabase.table('restaurants').select('id', count='exact').execute()
+            total = self.supabase.table('restaurants').select('id', count='exact').limit(1).execute()
             
             return {
                 'total_restaurants': total.count if total.count else 0,
@@ -5,7 +5,9 @@ Main image downloader script that orchestrates the entire process.
 import os
 import sys
 import time
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from tqdm import tqdm
 from dotenv import load_dotenv
 
@@ -19,7 +21,7 @@ from image_processor import ImageProcessor
 from supabase_storage import SupabaseStorageManager
 from database_manager import DatabaseManager
 from progress_tracker import ProgressTracker
-from config import BATCH_SIZE, RETRY_DELAY, MAX_RETRIES
+from config import BATCH_SIZE, RETRY_DELAY, MAX_RETRIES, IMAGE_WORKERS, DOWNLOAD_INTERVAL
 
 
 class ImageDownloader:
@@ -31,6 +33,17 @@ class ImageDownloader:
         self.storage_manager = SupabaseStorageManager()
         self.database_manager = DatabaseManager()
         self.progress_tracker = ProgressTracker()
+        # Download pacing shared by all image workers
+        self._rate_lock = threading.Lock()
+        self._last_request_at = 0.0
+    
+    def _wait_for_request_slot(self):
+        """Block until DOWNLOAD_INTERVAL has passed since the previous download started (any worker)."""
+        with self._rate_lock:
+            wait = self._last_request_at + DOWNLOAD_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request_at = time.monotonic()
     
     def setup(self) -> bool:
         """Setup storage bucket and database."""
@@ -95,48 +108,21 @@ class ImageDownloader:
         # Backup original URLs
         self.database_manager.backup_original_urls(restaurant_id, image_urls)
         
-        for index, original_url in enumerate(image_urls):
-            try:
-                print(f"  📥 Downloading image {index + 1}/{len(image_urls)}: {original_url}")
-                
-                # Download image
-                image_bytes = self.image_processor.download_image(original_url)
-                if not image_bytes:
-                    print(f"  ❌ Failed to download image {index + 1}")
-                    failed_count += 1
-                    errors.append(f"Download failed: {original_url}")
-                    continue
-                
-                # Process image
-                processed_bytes = self.image_processor.process_image(image_bytes, original_url)
-                if not processed_bytes:
-                    print(f"  ❌ Failed to process image {index + 1}")
-                    failed_count += 1
-                    errors.append(f"Processing failed: {original_url}")
-                    continue
-                
-                # Generate filename
-                filename = self.image_processor.generate_filename(original_url, restaurant_id, index)
-                
-                # Upload to Supabase Storage
-                new_url = self.storage_manager.upload_image(processed_bytes, filename)
-                if not new_url:
-                    print(f"  ❌ Failed to upload image {index + 1}")
-                    failed_count += 1
-                    errors.append(f"Upload failed: {original_url}")
-                    continue
-                
+        # Images are independent (download -> process -> upload is mostly I/O wait),
+        # so fan them out; map() keeps results in the original image order
+        with ThreadPoolExecutor(max_workers=IMAGE_WORKERS) as executor:
+            outcomes = list(executor.map(
+                lambda item: self._process_single_image(restaurant_id, item[0], item[1], len(image_urls)),
+                enumerate(image_urls)
+            ))
+        
+        for new_url, error in outcomes:
+            if new_url:
                 new_urls.append(new_url)
                 processed_count += 1
-                print(f"  ✅ Processed image {index + 1}: {filename}")
-                
-                # Small delay to avoid overwhelming the server
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"  ❌ Error processing image {index + 1}: {e}")
+            else:
                 failed_count += 1
-                errors.append(f"Unexpected error: {e}")
+                errors.append(error)
         
         # Update restaurant with new URLs if we processed any images
         if new_urls:
@@ -170,6 +156,45 @@ class ImageDownloader:
             'errors': errors
         }
     
+    def _process_single_image(self, restaurant_id: int, index: int, original_url: str, total: int) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Download, process and upload one image.
+        
+        Returns:
+            (new_url, None) on success, (None, error message) on failure
+        """
+        try:
+            print(f"  📥 Downloading image {index + 1}/{total}: {original_url}")
+            
+            # Download image
+            self._wait_for_request_slot()
+            image_bytes = self.image_processor.download_image(original_url)
+            if not image_bytes:
+                print(f"  ❌ Failed to download image {index + 1}")
+                return None, f"Download failed: {original_url}"
+            
+            # Process image
+            processed_bytes = self.image_processor.process_image(image_bytes, original_url)
+            if not processed_bytes:
+                print(f"  ❌ Failed to process image {index + 1}")
+                return None, f"Processing failed: {original_url}"
+            
+            # Generate filename
+            filename = self.image_processor.generate_filename(original_url, restaurant_id, index)
+            
+            # Upload to Supabase Storage
+            new_url = self.storage_manager.upload_image(processed_bytes, filename)
+            if not new_url:
+                print(f"  ❌ Failed to upload image {index + 1}")
+                return None, f"Upload failed: {original_url}"
+            
+            print(f"  ✅ Processed image {index + 1}: {filename}")
+            return new_url, None
+            
+        except Exception as e:
+            print(f"  ❌ Error processing image {index + 1}: {e}")
+            return None, f"Unexpected error: {e}"
+    
     def process_all_images(self, limit: Optional[int] = None, 
                           skip_processed: bool = True) -> Dict[str, Any]:
         """
@@ -229,6 +254,9 @@ class ImageDownloader:
                 print(f"⏳ Waiting {RETRY_DELAY} seconds before next batch...")
                 time.sleep(RETRY_DELAY)
         
+        # Fold the update log into the progress snapshot
+        self.progress_tracker.save_progress()
+        
         # Final summary
         total_processed = sum(r['processed'] for r in results)
         total_failed = sum(r['failed'] for r in results)
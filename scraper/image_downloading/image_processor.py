@@ -45,12 +45,22 @@ class ImageProcessor:
                 return None
             
             # Check file size
+            max_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
             content_length = response.headers.get('content-length')
-            if content_length and int(content_length) > MAX_FILE_SIZE_MB * 1024 * 1024:
+            if content_length and int(content_length) > max_bytes:
                 print(f"⚠️  Image too large: {url} ({content_length} bytes)")
                 return None
-            
-            return response.content
+
+            # Stream the body so oversized images without a content-length are dropped early
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                data.extend(chunk)
+                if len(data) > max_bytes:
+                    print(f"⚠️  Image too large: {url} (over {max_bytes} bytes)")
+                    response.close()
+                    return None
+
+            return bytes(data)
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to download {url}: {e}")
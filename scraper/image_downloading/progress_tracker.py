@@ -6,26 +6,58 @@ import json
 import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from config import PROGRESS_FILE
+from config import PROGRESS_FILE, PROGRESS_SNAPSHOT_EVERY
 
 
 class ProgressTracker:
-    """Tracks progress of image downloading and processing."""
+    """
+    Tracks progress of image downloading and processing.
+    
+    Per-restaurant updates are appended to a log next to the JSON snapshot;
+    the snapshot is rewritten only every PROGRESS_SNAPSHOT_EVERY updates.
+    """
     
     def __init__(self, progress_file: str = PROGRESS_FILE):
         """Initialize progress tracker."""
         self.progress_file = progress_file
+        self.log_file = os.path.splitext(progress_file)[0] + '.log'
+        self._seq = 0
+        self._updates_since_snapshot = 0
         self.progress_data = self.load_progress()
     
     def load_progress(self) -> Dict[str, Any]:
-        """Load progress from file."""
+        """Load progress from the snapshot, then replay updates logged after it."""
+        data = None
         if os.path.exists(self.progress_file):
             try:
                 with open(self.progress_file, 'r') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except Exception as e:
                 print(f"⚠️  Error loading progress file: {e}")
         
+        if data is None:
+            data = self._empty_progress()
+        self._seq = data.get('log_seq', 0)
+        
+        if os.path.exists(self.log_file):
+            try:
+                with open(self.log_file, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Partial line from an interrupted write
+                        # Entries at or below the snapshot's sequence are already folded in
+                        if entry.get('seq', 0) > self._seq:
+                            self._apply_restaurant_update(data, entry)
+                            self._seq = entry['seq']
+            except Exception as e:
+                print(f"⚠️  Error replaying progress log: {e}")
+        
+        return data
+    
+    def _empty_progress(self) -> Dict[str, Any]:
+        """Progress data for a tracker with no history."""
         return {
             'started_at': None,
             'last_updated': None,
@@ -39,11 +71,17 @@ class ProgressTracker:
         }
     
     def save_progress(self) -> bool:
-        """Save progress to file."""
+        """Write a full snapshot to file and clear the update log it now covers."""
         try:
             self.progress_data['last_updated'] = datetime.now().isoformat()
-            with open(self.progress_file, 'w') as f:
+            self.progress_data['log_seq'] = self._seq
+            # Replace atomically; log entries up to log_seq are ignored on load even if truncation never happens
+            tmp_file = self.progress_file + '.tmp'
+            with open(tmp_file, 'w') as f:
                 json.dump(self.progress_data, f, indent=2)
+            os.replace(tmp_file, self.progress_file)
+            open(self.log_file, 'w').close()
+            self._updates_since_snapshot = 0
             return True
         except Exception as e:
             print(f"❌ Error saving progress: {e}")
@@ -66,29 +104,52 @@ class ProgressTracker:
     
     def update_restaurant_progress(self, restaurant_id: int, status: str, 
                                  processed: int = 0, failed: int = 0, error: str = None):
-        """Update progress for a specific restaurant."""
-        self.progress_data['restaurant_progress'][str(restaurant_id)] = {
+        """Update progress for a specific restaurant (appends one log line; snapshots periodically)."""
+        self._seq += 1
+        entry = {
+            'seq': self._seq,
+            'restaurant_id': restaurant_id,
             'status': status,
             'processed': processed,
             'failed': failed,
             'error': error,
             'updated_at': datetime.now().isoformat()
         }
+        self._apply_restaurant_update(self.progress_data, entry)
+        self.progress_data['last_updated'] = entry['updated_at']
         
-        if status == 'completed':
-            self.progress_data['processed_restaurants'] += 1
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except Exception as e:
+            print(f"❌ Error logging progress: {e}")
         
-        self.progress_data['processed_images'] += processed
-        self.progress_data['failed_images'] += failed
+        self._updates_since_snapshot += 1
+        if self._updates_since_snapshot >= PROGRESS_SNAPSHOT_EVERY:
+            self.save_progress()
+    
+    def _apply_restaurant_update(self, data: Dict[str, Any], entry: Dict[str, Any]):
+        """Fold one logged restaurant update into progress data."""
+        data['restaurant_progress'][str(entry['restaurant_id'])] = {
+            'status': entry['status'],
+            'processed': entry['processed'],
+            'failed': entry['failed'],
+            'error': entry['error'],
+            'updated_at': entry['updated_at']
+        }
         
-        if error:
-            self.progress_data['errors'].append({
-                'restaurant_id': restaurant_id,
-                'error': error,
-                'timestamp': datetime.now().isoformat()
-            })
+        if entry['status'] == 'completed':
+            data['processed_restaurants'] += 1
         
-        self.save_progress()
+        data['processed_images'] += entry['processed']
+        data['failed_images'] += entry['failed']
+        
+        if entry['error']:
+            data['errors'].append({
+                'restaurant_id': entry['restaurant_id'],
+                'error': entry['error'],
+                'timestamp': entry['updated_at']
+            })
     
     def get_progress_summary(self) -> Dict[str, Any]:
         """Get current progress summary."""
@@ -137,17 +198,7 @@ class ProgressTracker:
     
     def reset_progress(self):
         """Reset all progress."""
-        self.progress_data = {
-            'started_at': None,
-            'last_updated': None,
-            'total_restaurants': 0,
-            'processed_restaurants': 0,
-            'total_images': 0,
-            'processed_images': 0,
-            'failed_images': 0,
-            'restaurant_progress': {},
-            'errors': []
-        }
+        self.progress_data = self._empty_progress()
         self.save_progress()
         print("🔄 Progress reset")
     
@@ -75,7 +75,7 @@ def test_sector_scraping():
     finally:
         scraper.page_loader.close_driver()
 
-def scrape_restaurants(start_sector: int = 0, max_sectors: Optional[int] = None, region: Optional[str] = None):
+def scrape_restaurants(start_sector: int = 0, max_sectors: Optional[int] = None, region: Optional[str] = None, workers: int = 1):
     """Scrape restaurants from all sectors with immediate database saving"""
     print("🍽️ Starting comprehensive restaurant scraping...")
     print("💾 Restaurants will be saved to database after each sector")
@@ -86,6 +86,11 @@ def scrape_restaurants(start_sector: int = 0, max_sectors: Optional[int] = None,
         if region:
             print(f"Scraping restaurants in region: {region}")
             restaurants = scraper.scrape_sectors_by_region(region, save_to_db=True)
+        elif workers > 1:
+            sectors = scraper.sector_grid.generate_sectors()
+            sectors = sectors[start_sector:start_sector + max_sectors] if max_sectors else sectors[start_sector:]
+            print(f"Scraping {len(sectors)} sectors with {workers} parallel browsers")
+            restaurants = scraper.scrape_sectors_concurrently(sectors, max_workers=workers, save_to_db=True, start_sector=start_sector)
         else:
             print(f"Scraping restaurants from sectors {start_sector + 1} onwards")
             if max_sectors:
@@ -223,6 +228,7 @@ def enhance_restaurants(limit: int = None, start_id: int = None, target_id: int
         # Track timing for progress estimation
         import time
         start_time = time.time()
+        last_fetch_at = None
 
         try:
             for i, r in enumerate(rows, 1):
@@ -234,16 +240,19 @@ def enhance_restaurants(limit: int = None, start_id: int = None, target_id: int
                 
                 print(f"🔄 [{i}/{len(rows)}] Enhancing {r.get('name', 'Unknown')} (missing: {', '.join(missing_fields)})")
                 
+                # Space page requests to avoid throttling/CAPTCHA; time spent parsing and
+                # updating the previous row already counts toward the gap
+                if last_fetch_at is not None:
+                    wait = Config.ENHANCE_DELAY_BETWEEN_PAGES - (time.monotonic() - last_fetch_at)
+                    if wait > 0:
+                        print(f"  ⏳ Waiting {wait:.1f}s to avoid throttling...")
+                        time.sleep(wait)
+                last_fetch_at = time.monotonic()
+                
                 details = enhancer.fetch_details(url)
                 if not details:
                     print(f"  ❌ Failed to fetch details")
                     continue
-                
-                # Add delay between page requests to avoid throttling/CAPTCHA
-                if i < len(rows):  # Don't delay after the last item
-                    delay = Config.ENHANCE_DELAY_BETWEEN_PAGES
-                    print(f"  ⏳ Waiting {delay}s to avoid throttling...")
-                    time.sleep(delay)
 
                 fields = {
                     'phone': details.get('phone') or r.get('phone'),
@@ -437,6 +446,7 @@ def show_help():
     print("  python main.py scrape --start N        - Start from sector N")
     print("  python main.py scrape --max N           - Process maximum N sectors")
     print("  python main.py scrape --region REGION  - Scrape specific region")
+    print("  python main.py scrape --workers N      - Scrape sectors with N parallel browsers")
     print("  python main.py list-sessions          - List available scraping sessions")
     print("  python main.py resume SESSION_ID      - Resume a specific session")
     print("  python main.py clear-db                - Clear restaurants + logs")
@@ -482,6 +492,11 @@ def main():
                 print("❌ Session ID required for resume command")
                 print("Use 'python main.py list-sessions' to see available sessions")
                 return
+            if len(sys.argv) > 3:
+                # Resumed sessions always run sequentially; don't silently drop options like --workers
+                print(f"❌ Unexpected arguments for resume: {' '.join(sys.argv[3:])}")
+                print("Use 'python main.py resume SESSION_ID'")
+                return
             session_id = sys.argv[2]
             resume_session(session_id)
             return
@@ -490,6 +505,7 @@ def main():
             start_sector = 0
             max_sectors = None
             region = None
+            workers = 1
             
             i = 2
             while i < len(sys.argv):
@@ -511,12 +527,23 @@ def main():
                 elif arg == "--region" and i + 1 < len(sys.argv):
                     region = sys.argv[i + 1]
                     i += 2
+                elif arg == "--workers" and i + 1 < len(sys.argv):
+                    try:
+                        workers = int(sys.argv[i + 1])
+                        i += 2
+                    except ValueError:
+                        print("❌ Invalid workers. Must be a number.")
+                        return
                 else:
                     print(f"❌ Unknown argument: {arg}")
                     print("Use 'python main.py help' for available options")
                     return
             
-            scrape_restaurants(start_sector=start_sector, max_sectors=max_sectors, region=region)
+            if workers > 1 and region:
+                print("❌ --workers cannot be combined with --region (region scraping runs sequentially)")
+                return
+            
+            scrape_restaurants(start_sector=start_sector, max_sectors=max_sectors, region=region, workers=workers)
             return
         elif command == "enhance":
             # Parse enhance arguments
@@ -5,13 +5,118 @@ Extracts restaurant data from loaded pages
 
 import re
 import json
-import time
 import logging
-from typing import List, Dict, Optional
-from selenium.webdriver.common.by import By
+from typing import List, Dict, Optional, Set, Tuple
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Selectors probed inside each restaurant card, in priority order
+CARD_SELECTORS = {
+    'name': [
+        "h1", "h2", "h3", ".name", ".title", ".restaurant-name",
+        ".venue-name", ".business-name", ".establishment-name"
+    ],
+    'address': [
+        ".address", ".location", ".venue-address", ".business-address",
+        "[data-address]", ".street-address"
+    ],
+    'phone': [".phone", ".tel", "[href^='tel:']", ".contact-phone", "[data-phone]"],
+    'rating': [".rating", ".stars", ".score", ".review-rating", "[data-rating]", ".avg-rating"],
+    'cuisine': [".cuisine", ".cuisine-type", ".food-type", ".category"],
+    'price': [".price", ".price-range", ".cost", ".budget"],
+    'hours': [".hours", ".opening-hours", ".schedule", ".time"],
+    'description': [".description", ".summary", ".about", ".details"],
+}
+
+# Start of a JSON array of objects embedded in an inline script
+JSON_ARRAY_START = re.compile(r'\[\s*\{')
+
+NUMBER_PATTERN = re.compile(r'\d+\.?\d*', re.ASCII)
+
+# Static parsing only builds restaurant card subtrees; the rest of the page (map, nav, scripts) is skipped
+CARD_STRAINER = SoupStrainer(attrs={'data-marker-id': True})
+
+# Selectors probed inside a marker popup, in priority order
+POPUP_SELECTORS = {
+    'name': ["h1", "h2", "h3", ".name", ".title", ".restaurant-name"],
+    'address': [".address", ".location", ".venue-address"],
+    'phone': [".phone", ".tel", "[href^='tel:']"],
+    'rating': [".rating", ".stars", ".score"],
+}
+
+# Shared JS helpers. text() mirrors WebElement.text: elements that are not rendered yield ''.
+# probe() returns, per field, [text, href] of the first match of each selector (null if none).
+_PROBE_HELPERS_JS = """
+const text = el => (el && el.getClientRects().length ? el.innerText : '').trim();
+const probe = (root, fields) => {
+    const probes = {};
+    for (const [field, selectors] of Object.entries(fields)) {
+        probes[field] = selectors.map(sel => {
+            const el = root.querySelector(sel);
+            return el ? [text(el), el.href || null] : null;
+        });
+    }
+    return probes;
+};
+"""
+
+# Reads every card's attributes, probe texts and links in one execute_script call
+CARD_SNAPSHOT_JS = _PROBE_HELPERS_JS + """
+const fields = arguments[0];
+return Array.from(document.querySelectorAll('[data-marker-id]')).map(card => {
+    const details = card.querySelector('.details.hidden');
+    const website = card.querySelector("a[href^='http']");
+    return {
+        marker_id: card.getAttribute('data-marker-id'),
+        has_details: details !== null,
+        lat: details ? details.getAttribute('data-lat') : null,
+        lng: details ? details.getAttribute('data-lng') : null,
+        text: text(card),
+        class_name: card.getAttribute('class') || '',
+        hrefs: Array.from(card.querySelectorAll('a[href]')).map(a => a.href),
+        website: website ? website.href : '',
+        probes: probe(card, fields)
+    };
+});
+"""
+
+# First element matching any selector, tried in priority order (null if none)
+FIRST_MATCH_JS = """
+for (const sel of arguments[0]) {
+    const el = document.querySelector(sel);
+    if (el) return el;
+}
+return null;
+"""
+
+# Clicks the first element matching any selector in priority order; returns whether one was found
+CLICK_FIRST_MATCH_JS = """
+for (const sel of arguments[0]) {
+    const el = document.querySelector(sel);
+    if (el) { el.click(); return true; }
+}
+return false;
+"""
+
+# Containers a marker popup renders into
+POPUP_CONTAINER_SELECTORS = [
+    ".leaflet-popup-content",
+    ".popup-content",
+    ".marker-popup",
+    ".restaurant-popup"
+]
+
+# Reads a popup's name/address/phone/rating probes, website link and text in one call
+POPUP_SNAPSHOT_JS = _PROBE_HELPERS_JS + """
+const popup = arguments[0];
+const website = popup.querySelector("a[href^='http']");
+return {
+    text: text(popup),
+    website: website ? website.href : null,
+    probes: probe(popup, arguments[1])
+};
+"""
 
 class HappyCowDataExtractor:
     """Extracts restaurant data from HappyCow searchmap pages"""
@@ -46,8 +151,13 @@ class HappyCowDataExtractor:
                 restaurants.extend(dom_restaurants)
                 self.logger.info(f"Extracted {len(dom_restaurants)} restaurants from DOM")
             
-            # Method 4: Try to get detailed info by clicking markers
-            detailed_restaurants = self._extract_detailed_info_by_clicking()
+            # Method 4: Try to get detailed info by clicking markers.
+            # Merging keeps details only for coordinates already found, so only those markers are clicked
+            known_coords = {
+                (r['latitude'], r['longitude']) for r in restaurants
+                if 'latitude' in r and 'longitude' in r
+            }
+            detailed_restaurants = self._extract_detailed_info_by_clicking(known_coords) if known_coords else []
             if detailed_restaurants:
                 # Replace basic restaurants with detailed ones where possible
                 restaurants = self._merge_restaurant_data(restaurants, detailed_restaurants)
@@ -79,9 +189,17 @@ class HappyCowDataExtractor:
             
             restaurants = []
             
-            for var_name in js_vars:
+            # Read every global in one round-trip; values that cannot be serialized
+            # (e.g. cyclic Leaflet objects) come back as null instead of failing the batch
+            values = self.driver.execute_script("""
+                return arguments[0].map(name => {
+                    try { return JSON.parse(JSON.stringify(window[name.split('.')[1]]) ?? 'null'); }
+                    catch (e) { return null; }
+                });
+            """, js_vars) or []
+            
+            for data in values:
                 try:
-                    data = self.driver.execute_script(f"return {var_name};")
                     if data and isinstance(data, (list, dict)):
                         if isinstance(data, list):
                             for item in data:
@@ -100,93 +218,78 @@ class HappyCowDataExtractor:
             return []
     
     def _extract_from_page_source(self) -> List[Dict]:
-        """Extract restaurant data from page source using regex"""
+        """Extract restaurant data from inline scripts using regex"""
         try:
-            page_source = self.driver.page_source
+            # Only inline <script> bodies can hold raw JSON arrays; attribute values are
+            # HTML-escaped, so fetch just those instead of serializing the whole DOM
+            script_text = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll('script:not([src])'))"
+                ".map(s => s.textContent).join('\\n');"
+            ) or ''
             restaurants = []
             
-            # Pattern 1: Look for JSON data structures
-            json_patterns = [
-                r'\[\{.*?"name".*?\}\]',  # Array of objects with name
-                r'\[\{.*?"lat".*?"lng".*?\}\]',  # Array of objects with coordinates
-                r'\[\{.*?"restaurant".*?\}\]'  # Array of restaurant objects
-            ]
-            
-            for pattern in json_patterns:
-                matches = re.findall(pattern, page_source, re.DOTALL)
-                for match in matches:
-                    try:
-                        data = json.loads(match)
-                        if isinstance(data, list):
-                            for item in data:
-                                if self._is_valid_restaurant_data(item):
-                                    restaurants.append(self._normalize_restaurant_data(item))
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Pattern 2: Look for data attributes
-            data_attr_pattern = r'data-lat="([^"]+)"[^>]*data-lng="([^"]+)"[^>]*title="([^"]+)"'
-            matches = re.findall(data_attr_pattern, page_source)
-            for lat, lng, title in matches:
+            # Pattern 1: Look for JSON data structures.
+            # One scan for array starts; each candidate is decoded in place, and the
+            # scan resumes after a decoded array so nested arrays are not revisited.
+            decoder = json.JSONDecoder()
+            resume_at = 0
+            for match in JSON_ARRAY_START.finditer(script_text):
+                if match.start() < resume_at:
+                    continue
                 try:
-                    restaurant = {
-                        'name': title,
-                        'latitude': float(lat),
-                        'longitude': float(lng),
-                        'address': 'Address not available',
-                        'is_vegan': False,
-                        'is_vegetarian': False,
-                        'has_veg_options': False
-                    }
-                    restaurants.append(restaurant)
-                except ValueError:
+                    data, resume_at = decoder.raw_decode(script_text, match.start())
+                except json.JSONDecodeError:
                     continue
+                for item in data:
+                    if self._is_valid_restaurant_data(item):
+                        restaurants.append(self._normalize_restaurant_data(item))
             
+            # Pattern 2: Look for data attributes (queried in the browser, not regexed)
+            restaurants.extend(self._extract_from_data_attributes())
+
             return restaurants
-            
+
         except Exception as e:
             self.logger.error(f"Error extracting from page source: {e}")
             return []
+
+    def _extract_from_data_attributes(self) -> List[Dict]:
+        """Extract titled elements carrying data-lat/data-lng with a single execute_script call"""
+        try:
+            # Returns a compact [[lat, lng, title], ...] array instead of shipping the whole DOM
+            rows = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll('[data-lat][data-lng][title]'))"
+                ".map(e => [parseFloat(e.dataset.lat), parseFloat(e.dataset.lng), e.getAttribute('title')]);"
+            ) or []
+
+            restaurants = []
+            for lat, lng, title in rows:
+                # parseFloat yields NaN (null over the wire) for malformed values
+                if lat is None or lng is None or not title:
+                    continue
+                restaurants.append({
+                    'name': title,
+                    'latitude': float(lat),
+                    'longitude': float(lng),
+                    'address': 'Address not available',
+                    'is_vegan': False,
+                    'is_vegetarian': False,
+                    'has_veg_options': False
+                })
+
+            return restaurants
+
+        except Exception as e:
+            self.logger.error(f"Error extracting from data attributes: {e}")
+            return []
     
     def _extract_from_dom(self) -> List[Dict]:
         """Extract restaurant data from DOM elements using data-marker-id divs"""
         try:
-            restaurants = []
-            
-            # Look for restaurant cards with data-marker-id attribute
-            restaurant_cards = self.driver.find_elements(By.CSS_SELECTOR, "[data-marker-id]")
-            
-            self.logger.info(f"Found {len(restaurant_cards)} restaurant cards with data-marker-id")
-            
-            for i, card in enumerate(restaurant_cards):
-                try:
-                    # Get marker ID
-                    marker_id = card.get_attribute('data-marker-id')
-                    
-                    # Look for coordinates in child div with class "details hidden"
-                    details_div = card.find_element(By.CSS_SELECTOR, ".details.hidden")
-                    
-                    if details_div:
-                        # Get coordinates from the details div
-                        lat = details_div.get_attribute('data-lat')
-                        lng = details_div.get_attribute('data-lng')
-                        
-                        if lat and lng:
-                            # Extract restaurant information from the card
-                            restaurant = self._extract_restaurant_info_from_card(card, marker_id, lat, lng)
-                            
-                            if restaurant:
-                                restaurants.append(restaurant)
-                                self.logger.debug(f"Extracted restaurant {i+1}: {restaurant['name']} at ({lat}, {lng})")
-                        else:
-                            self.logger.warning(f"Restaurant card {i+1} (ID: {marker_id}) has no coordinates")
-                    else:
-                        self.logger.warning(f"Restaurant card {i+1} (ID: {marker_id}) has no details div")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error processing restaurant card {i+1}: {e}")
-                    continue
+            # Snapshot every restaurant card (data-marker-id) in a single round-trip
+            restaurant_cards = self.driver.execute_script(CARD_SNAPSHOT_JS, CARD_SELECTORS) or []
             
+            restaurants = self._restaurants_from_cards(restaurant_cards)
             self.logger.info(f"Successfully extracted {len(restaurants)} restaurants from DOM")
             return restaurants
             
@@ -194,21 +297,107 @@ class HappyCowDataExtractor:
             self.logger.error(f"Error extracting from DOM: {e}")
             return []
     
-    def _extract_restaurant_info_from_card(self, card, marker_id: str, lat: str, lng: str) -> Optional[Dict]:
-        """Extract detailed restaurant information from a restaurant card"""
+    def extract_restaurants_from_html(self, html) -> List[Dict]:
+        """Extract restaurant cards from server-rendered HTML without a browser"""
+        try:
+            soup = BeautifulSoup(html, 'lxml', parse_only=CARD_STRAINER)
+            restaurant_cards = [self._snapshot_card_from_html(card) for card in soup.select('[data-marker-id]')]
+            
+            restaurants = self._restaurants_from_cards(restaurant_cards)
+            self.logger.info(f"Successfully extracted {len(restaurants)} restaurants from static HTML")
+            return self._remove_duplicates(restaurants)
+            
+        except Exception as e:
+            self.logger.error(f"Error extracting from static HTML: {e}")
+            return []
+    
+    def _snapshot_card_from_html(self, card) -> Dict:
+        """Build the same card snapshot as CARD_SNAPSHOT_JS from a parsed HTML element"""
+        def is_hidden(el) -> bool:
+            # Approximates WebElement.text visibility: skip anything inside a .hidden element
+            for node in [el] + list(el.parents):
+                if 'hidden' in (node.get('class') or []) or 'display:none' in (node.get('style') or '').replace(' ', ''):
+                    return True
+                if node is card:
+                    break
+            return False
+        
+        def text(el) -> str:
+            if el is None or is_hidden(el):
+                return ''
+            lines = [s.strip() for s in el.find_all(string=True) if s.strip() and not is_hidden(s.parent)]
+            return '\n'.join(lines)
+        
+        details = card.select_one('.details.hidden')
+        website = card.select_one("a[href^='http']")
+        probes = {}
+        for field, selectors in CARD_SELECTORS.items():
+            probes[field] = []
+            for selector in selectors:
+                el = card.select_one(selector)
+                probes[field].append([text(el), el.get('href')] if el is not None else None)
+        
+        return {
+            'marker_id': card.get('data-marker-id'),
+            'has_details': details is not None,
+            'lat': details.get('data-lat') if details is not None else None,
+            'lng': details.get('data-lng') if details is not None else None,
+            'text': text(card),
+            'class_name': ' '.join(card.get('class') or []),
+            'hrefs': [a.get('href') for a in card.select('a[href]')],
+            'website': website.get('href') if website is not None else '',
+            'probes': probes
+        }
+    
+    def _restaurants_from_cards(self, restaurant_cards: List[Dict]) -> List[Dict]:
+        """Turn card snapshots into restaurant dicts, skipping cards without coordinates"""
+        restaurants = []
+        
+        self.logger.info(f"Found {len(restaurant_cards)} restaurant cards with data-marker-id")
+        
+        for i, card in enumerate(restaurant_cards):
+            try:
+                # Get marker ID
+                marker_id = card.get('marker_id')
+                
+                # Coordinates come from the child div with class "details hidden"
+                if card.get('has_details'):
+                    lat = card.get('lat')
+                    lng = card.get('lng')
+                    
+                    if lat and lng:
+                        # Extract restaurant information from the card
+                        restaurant = self._extract_restaurant_info_from_card(card, marker_id, lat, lng)
+                        
+                        if restaurant:
+                            restaurants.append(restaurant)
+                            self.logger.debug("Extracted restaurant %d: %s at (%s, %s)", i + 1, restaurant['name'], lat, lng)
+                    else:
+                        self.logger.warning("Restaurant card %d (ID: %s) has no coordinates", i + 1, marker_id)
+                else:
+                    self.logger.warning("Restaurant card %d (ID: %s) has no details div", i + 1, marker_id)
+                    
+            except Exception as e:
+                self.logger.warning("Error processing restaurant card %d: %s", i + 1, e)
+                continue
+        
+        return restaurants
+    
+    def _extract_restaurant_info_from_card(self, card: Dict, marker_id: str, lat: str, lng: str) -> Optional[Dict]:
+        """Extract detailed restaurant information from a restaurant card snapshot"""
         try:
             # Extract restaurant name
             name = self._extract_restaurant_name(card)
             
             # Extract address
-            address = self._extract_restaurant_address(card)
+            address = self._first_probe_text(card, 'address') or "Address not available"
             
             # Extract phone
             phone = self._extract_restaurant_phone(card)
             
             # Extract website and HappyCow reviews link
-            website = self._extract_restaurant_website(card)
-            cow_reviews = self._extract_happycow_reviews_link(card)
+            website = card.get('website') or ""
+            cow_reviews = self._extract_happycow_reviews_link(card.get('hrefs') or [])
             
             # Extract rating
             rating = self._extract_restaurant_rating(card)
@@ -217,10 +406,10 @@ class HappyCowDataExtractor:
             is_vegan, is_vegetarian, has_veg_options = self._extract_restaurant_type(card)
             
             # Extract additional info
-            cuisine_type = self._extract_cuisine_type(card)
-            price_range = self._extract_price_range(card)
-            hours = self._extract_hours(card)
-            description = self._extract_description(card)
+            cuisine_type = self._first_probe_text(card, 'cuisine')
+            price_range = self._first_probe_text(card, 'price')
+            hours = self._first_probe_text(card, 'hours')
+            description = self._first_probe_text(card, 'description')
             
             restaurant = {
                 'name': name,
@@ -247,219 +436,85 @@ class HappyCowDataExtractor:
             self.logger.warning(f"Error extracting restaurant info from card: {e}")
             return None
     
-    def _extract_restaurant_name(self, card) -> str:
-        """Extract restaurant name from card"""
-        try:
-            # Try various selectors for restaurant name
-            name_selectors = [
-                "h1", "h2", "h3", ".name", ".title", ".restaurant-name", 
-                ".venue-name", ".business-name", ".establishment-name"
-            ]
-            
-            for selector in name_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            # Fallback: look for any text content in the card
-            card_text = card.text.strip()
-            if card_text:
-                # Take the first line as the name
-                first_line = card_text.split('\n')[0].strip()
-                if first_line and len(first_line) < 100:  # Reasonable name length
-                    return first_line
-            
-            return "Unknown Restaurant"
-            
-        except Exception:
-            return "Unknown Restaurant"
+    def _first_probe_text(self, card: Dict, field: str) -> str:
+        """Return the text of the first selector for a field that matched non-empty text"""
+        for probe in card.get('probes', {}).get(field) or []:
+            if probe and probe[0]:
+                return probe[0]
+        return ""
     
-    def _extract_restaurant_address(self, card) -> str:
-        """Extract restaurant address from card"""
-        try:
-            address_selectors = [
-                ".address", ".location", ".venue-address", ".business-address",
-                "[data-address]", ".street-address"
-            ]
-            
-            for selector in address_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            return "Address not available"
-            
-        except Exception:
-            return "Address not available"
+    def _extract_restaurant_name(self, card: Dict) -> str:
+        """Extract restaurant name from card"""
+        name = self._first_probe_text(card, 'name')
+        if name:
+            return name
+        
+        # Fallback: look for any text content in the card
+        card_text = (card.get('text') or '').strip()
+        if card_text:
+            # Take the first line as the name
+            first_line = card_text.split('\n')[0].strip()
+            if first_line and len(first_line) < 100:  # Reasonable name length
+                return first_line
+        
+        return "Unknown Restaurant"
     
-    def _extract_restaurant_phone(self, card) -> str:
+    def _extract_restaurant_phone(self, card: Dict) -> str:
         """Extract restaurant phone from card"""
-        try:
-            phone_selectors = [
-                ".phone", ".tel", "[href^='tel:']", ".contact-phone",
-                "[data-phone]"
-            ]
-            
-            for selector in phone_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    phone_text = elements[0].text.strip() or elements[0].get_attribute('href')
-                    if phone_text:
-                        return phone_text
-            
-            return ""
-            
-        except Exception:
-            return ""
-    
-    def _extract_restaurant_website(self, card) -> str:
-        """Extract restaurant website from card"""
-        try:
-            website_elements = card.find_elements(By.CSS_SELECTOR, "a[href^='http']")
-            if website_elements:
-                return website_elements[0].get_attribute('href')
-            return ""
-            
-        except Exception:
-            return ""
+        for probe in card.get('probes', {}).get('phone') or []:
+            if probe:
+                phone_text = probe[0] or probe[1]
+                if phone_text:
+                    return phone_text
+        return ""
 
-    def _extract_happycow_reviews_link(self, card) -> str:
+    def _extract_happycow_reviews_link(self, hrefs: List[str]) -> str:
         """Extract the HappyCow reviews/details link.
         Accepts either relative '/reviews/...' or absolute 'https://www.happycow.net/reviews/...'.
         Filters out Google Maps links and strips trailing '#' anchors.
         """
-        try:
-            anchors = card.find_elements(By.CSS_SELECTOR, "a[href]")
-            for a in anchors:
-                href = (a.get_attribute('href') or '').strip()
-                if not href:
-                    continue
-                # Skip Google Maps or other non-HappyCow links
-                if 'google.com/maps' in href:
-                    continue
-                # Normalize to absolute HappyCow URL
-                if href.startswith('/reviews/'):
-                    url = f"https://www.happycow.net{href}"
-                elif href.startswith('https://www.happycow.net/reviews/') or href.startswith('http://www.happycow.net/reviews/'):
-                    url = href
-                else:
-                    continue
-                # Drop a single trailing '#'
-                if url.endswith('#'):
-                    url = url[:-1]
-                return url
-            return ""
-        except Exception:
-            return ""
+        for href in hrefs:
+            href = (href or '').strip()
+            if not href:
+                continue
+            # Skip Google Maps or other non-HappyCow links
+            if 'google.com/maps' in href:
+                continue
+            # Normalize to absolute HappyCow URL
+            if href.startswith('/reviews/'):
+                url = f"https://www.happycow.net{href}"
+            elif href.startswith('https://www.happycow.net/reviews/') or href.startswith('http://www.happycow.net/reviews/'):
+                url = href
+            else:
+                continue
+            # Drop a single trailing '#'
+            if url.endswith('#'):
+                url = url[:-1]
+            return url
+        return ""
     
-    def _extract_restaurant_rating(self, card) -> float:
+    def _extract_restaurant_rating(self, card: Dict) -> float:
         """Extract restaurant rating from card"""
-        try:
-            rating_selectors = [
-                ".rating", ".stars", ".score", ".review-rating",
-                "[data-rating]", ".avg-rating"
-            ]
-            
-            for selector in rating_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
+        for probe in card.get('probes', {}).get('rating') or []:
+            if probe and probe[0]:
+                # Extract number from text
+                numbers = NUMBER_PATTERN.findall(probe[0])
+                if numbers:
                     try:
-                        # Extract number from text
-                        import re
-                        numbers = re.findall(r'\d+\.?\d*', elements[0].text.strip())
-                        if numbers:
-                            return float(numbers[0])
+                        return float(numbers[0])
                     except ValueError:
                         continue
-            
-            return 0.0
-            
-        except Exception:
-            return 0.0
+        return 0.0
     
-    def _extract_restaurant_type(self, card) -> tuple:
+    def _extract_restaurant_type(self, card: Dict) -> tuple:
         """Extract restaurant type (vegan, vegetarian, veg-friendly) from card"""
-        try:
-            card_text = card.text.lower()
-            class_name = card.get_attribute('class') or ''
-            all_text = (card_text + ' ' + class_name).lower()
-            
-            is_vegan = 'vegan' in all_text and 'vegetarian' not in all_text
-            is_vegetarian = 'vegetarian' in all_text and not is_vegan
-            has_veg_options = ('veg' in all_text or 'vegetarian-friendly' in all_text) and not is_vegan and not is_vegetarian
-            
-            return is_vegan, is_vegetarian, has_veg_options
-            
-        except Exception:
-            return False, False, False
-    
-    def _extract_cuisine_type(self, card) -> str:
-        """Extract cuisine type from card"""
-        try:
-            cuisine_selectors = [
-                ".cuisine", ".cuisine-type", ".food-type", ".category"
-            ]
-            
-            for selector in cuisine_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            return ""
-            
-        except Exception:
-            return ""
-    
-    def _extract_price_range(self, card) -> str:
-        """Extract price range from card"""
-        try:
-            price_selectors = [
-                ".price", ".price-range", ".cost", ".budget"
-            ]
-            
-            for selector in price_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            return ""
-            
-        except Exception:
-            return ""
-    
-    def _extract_hours(self, card) -> str:
-        """Extract opening hours from card"""
-        try:
-            hours_selectors = [
-                ".hours", ".opening-hours", ".schedule", ".time"
-            ]
-            
-            for selector in hours_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            return ""
-            
-        except Exception:
-            return ""
-    
-    def _extract_description(self, card) -> str:
-        """Extract description from card"""
-        try:
-            desc_selectors = [
-                ".description", ".summary", ".about", ".details"
-            ]
-            
-            for selector in desc_selectors:
-                elements = card.find_elements(By.CSS_SELECTOR, selector)
-                if elements and elements[0].text.strip():
-                    return elements[0].text.strip()
-            
-            return ""
-            
-        except Exception:
-            return ""
+        all_text = ((card.get('text') or '') + ' ' + (card.get('class_name') or '')).lower()
+        
+        is_vegan = 'vegan' in all_text and 'vegetarian' not in all_text
+        is_vegetarian = 'vegetarian' in all_text and not is_vegan
+        has_veg_options = ('veg' in all_text or 'vegetarian-friendly' in all_text) and not is_vegan and not is_vegetarian
+        
+        return is_vegan, is_vegetarian, has_veg_options
     
     def _is_valid_restaurant_data(self, data: Dict) -> bool:
         """Check if data contains valid restaurant information"""
@@ -523,35 +578,31 @@ class HappyCowDataExtractor:
             self.logger.error(f"Error normalizing restaurant data: {e}")
             return None
     
-    def _extract_detailed_info_by_clicking(self) -> List[Dict]:
-        """Try to get detailed restaurant info by clicking on markers"""
+    def _extract_detailed_info_by_clicking(self, known_coords: Optional[Set[Tuple[float, float]]] = None) -> List[Dict]:
+        """Try to get detailed restaurant info by clicking on markers (only those at known_coords, if given)"""
         try:
             self.logger.info("Attempting to extract detailed info by clicking markers")
             
-            # Find all clickable markers
-            markers = self.driver.find_elements(By.CSS_SELECTOR, "[data-lat][data-lng]")
+            # Find clickable markers with their coordinates in one round-trip,
+            # limited to the first 10 to avoid overwhelming the page
+            markers = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll('[data-lat][data-lng]')).slice(0, 10)"
+                ".map(m => [m, m.getAttribute('data-lat'), m.getAttribute('data-lng')]);"
+            ) or []
             detailed_restaurants = []
             
-            # Limit to first 10 markers to avoid overwhelming the page
-            max_markers = min(10, len(markers))
-            
-            for i in range(max_markers):
+            for i, (marker, lat, lng) in enumerate(markers):
                 try:
-                    marker = markers[i]
-                    
-                    # Get basic coordinates first
-                    lat = marker.get_attribute('data-lat')
-                    lng = marker.get_attribute('data-lng')
-                    
                     if not lat or not lng:
                         continue
+                    if known_coords is not None and (float(lat), float(lng)) not in known_coords:
+                        continue
                     
                     # Click the marker
                     self.driver.execute_script("arguments[0].click();", marker)
-                    time.sleep(1)  # Wait for popup to appear
                     
-                    # Look for popup content
-                    popup_content = self._extract_popup_content()
+                    # Wait for the popup to appear, then read its content
+                    popup_content = self._extract_popup_content(timeout=2)
                     
                     if popup_content:
                         restaurant = {
@@ -571,14 +622,13 @@ class HappyCowDataExtractor:
                             'has_veg_options': popup_content.get('has_veg_options', False)
                         }
                         detailed_restaurants.append(restaurant)
-                        self.logger.debug(f"Extracted detailed info for restaurant {i+1}: {restaurant['name']}")
+                        self.logger.debug("Extracted detailed info for restaurant %d: %s", i + 1, restaurant['name'])
                     
                     # Close popup if it exists
                     self._close_popup()
-                    time.sleep(0.5)
                     
                 except Exception as e:
-                    self.logger.warning(f"Error clicking marker {i+1}: {e}")
+                    self.logger.warning("Error clicking marker %d: %s", i + 1, e)
                     self._close_popup()  # Try to close any open popup
                     continue
             
@@ -589,25 +639,22 @@ class HappyCowDataExtractor:
             self.logger.error(f"Error extracting detailed info by clicking: {e}")
             return []
     
-    def _extract_popup_content(self) -> Optional[Dict]:
-        """Extract content from any open popup"""
+    def _extract_popup_content(self, timeout: float = 0) -> Optional[Dict]:
+        """Extract content from any open popup, waiting up to timeout seconds for one to appear"""
         try:
-            # Look for various popup selectors
-            popup_selectors = [
-                ".leaflet-popup-content",
-                ".popup-content",
-                ".marker-popup",
-                ".restaurant-popup"
-            ]
-            
-            for selector in popup_selectors:
-                popups = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if popups:
-                    popup = popups[0]
-                    return self._parse_popup_content(popup)
+            if timeout:
+                popup = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                    lambda d: d.execute_script(FIRST_MATCH_JS, POPUP_CONTAINER_SELECTORS)
+                )
+            else:
+                popup = self.driver.execute_script(FIRST_MATCH_JS, POPUP_CONTAINER_SELECTORS)
+            if popup:
+                return self._parse_popup_content(popup)
             
             return None
             
+        except TimeoutException:
+            return None
         except Exception as e:
             self.logger.warning(f"Error extracting popup content: {e}")
             return None
@@ -617,50 +664,39 @@ class HappyCowDataExtractor:
         try:
             content = {}
             
+            # Probe all popup fields in a single round-trip
+            popup = self.driver.execute_script(POPUP_SNAPSHOT_JS, popup_element, POPUP_SELECTORS)
+            
             # Try to find restaurant name
-            name_selectors = ["h1", "h2", "h3", ".name", ".title", ".restaurant-name"]
-            for selector in name_selectors:
-                name_elements = popup_element.find_elements(By.CSS_SELECTOR, selector)
-                if name_elements and name_elements[0].text.strip():
-                    content['name'] = name_elements[0].text.strip()
-                    break
+            name = self._first_probe_text(popup, 'name')
+            if name:
+                content['name'] = name
             
             # Try to find address
-            address_selectors = [".address", ".location", ".venue-address"]
-            for selector in address_selectors:
-                address_elements = popup_element.find_elements(By.CSS_SELECTOR, selector)
-                if address_elements and address_elements[0].text.strip():
-                    content['address'] = address_elements[0].text.strip()
-                    break
+            address = self._first_probe_text(popup, 'address')
+            if address:
+                content['address'] = address
             
             # Try to find phone
-            phone_selectors = [".phone", ".tel", "[href^='tel:']"]
-            for selector in phone_selectors:
-                phone_elements = popup_element.find_elements(By.CSS_SELECTOR, selector)
-                if phone_elements:
-                    phone_text = phone_elements[0].text.strip() or phone_elements[0].get_attribute('href')
-                    if phone_text:
-                        content['phone'] = phone_text
-                        break
+            phone = self._extract_restaurant_phone(popup)
+            if phone:
+                content['phone'] = phone
             
             # Try to find website
-            website_elements = popup_element.find_elements(By.CSS_SELECTOR, "a[href^='http']")
-            if website_elements:
-                content['website'] = website_elements[0].get_attribute('href')
+            if popup.get('website') is not None:
+                content['website'] = popup['website']
             
             # Try to find rating
-            rating_selectors = [".rating", ".stars", ".score"]
-            for selector in rating_selectors:
-                rating_elements = popup_element.find_elements(By.CSS_SELECTOR, selector)
-                if rating_elements and rating_elements[0].text.strip():
+            for probe in popup['probes'].get('rating') or []:
+                if probe and probe[0]:
                     try:
-                        content['rating'] = float(rating_elements[0].text.strip())
+                        content['rating'] = float(probe[0])
                         break
                     except ValueError:
                         continue
             
             # Determine restaurant type from text content
-            popup_text = popup_element.text.lower()
+            popup_text = (popup.get('text') or '').lower()
             content['is_vegan'] = 'vegan' in popup_text and 'vegetarian' not in popup_text
             content['is_vegetarian'] = 'vegetarian' in popup_text and not content['is_vegan']
             content['has_veg_options'] = 'veg' in popup_text and not content['is_vegan'] and not content['is_vegetarian']
@@ -681,15 +717,16 @@ class HappyCowDataExtractor:
                 "[aria-label='Close']"
             ]
             
-            for selector in close_selectors:
-                close_buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if close_buttons:
-                    close_buttons[0].click()
-                    time.sleep(0.5)
-                    break
+            # Find and click the close button in the browser, then wait only until the popup is gone
+            if self.driver.execute_script(CLICK_FIRST_MATCH_JS, close_selectors):
+                WebDriverWait(self.driver, 1, poll_frequency=0.1).until_not(
+                    lambda d: d.execute_script(FIRST_MATCH_JS, POPUP_CONTAINER_SELECTORS)
+                )
                     
+        except TimeoutException:
+            self.logger.debug("Popup still open after close click")
         except Exception as e:
-            self.logger.debug(f"Error closing popup: {e}")
+            self.logger.debug("Error closing popup: %s", e)
     
     def _merge_restaurant_data(self, basic_restaurants: List[Dict], detailed_restaurants: List[Dict]) -> List[Dict]:
         """Merge basic restaurant data with detailed information"""
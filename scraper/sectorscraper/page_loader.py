@@ -3,16 +3,138 @@ Page Loader for HappyCow SearchMap
 Handles loading and waiting for content on each sector page
 """
 
-import time
 import logging
+import os
+import re
 from typing import Optional, Dict
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+# Resources never read by the scraper (images, fonts, media, ads, trackers).
+# CSS stays: hidden-element detection and rendered text depend on it.
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.webp', '*.gif', '*.avif', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*',
+    '*googlesyndication*', '*adservice.google*', '*connect.facebook.net*'
+]
+
+INTEGER_PATTERN = re.compile(r'\d+', re.ASCII)
+
+# Desktop Chrome UA shared by the browser and plain HTTP fetches
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Profile-level content settings: 2 = block
+CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2
+}
+
+# Switches that trim startup and navigation work (features the scraper never uses)
+CHROME_PERF_ARGS = [
+    '--blink-settings=imagesEnabled=false',
+    '--disable-features=Translate,BackForwardCache,IsolateOrigins,site-per-process',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-client-side-phishing-detection',
+    '--safebrowsing-disable-auto-update',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    '--disable-breakpad',
+    '--disable-hang-monitor',
+    '--password-store=basic',
+    '--disable-blink-features=AutomationControlled',
+    # Keep timers and rendering at full speed when several sessions share the machine
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-ipc-flooding-protection'
+]
+
+# First-match text for each selector in one round-trip (null when nothing matches).
+# Unrendered elements yield '' to mirror WebElement.text.
+FIRST_TEXTS_JS = """
+return arguments[0].map(sel => {
+    const el = document.querySelector(sel);
+    if (!el) return null;
+    return (el.getClientRects().length ? el.innerText : '').trim();
+});
+"""
+
+# Exact (lower-cased) titles of anti-bot interstitials, e.g. Cloudflare's "Just a moment..."
+BLOCK_PAGE_TITLES = ['just a moment...', 'attention required! | cloudflare', 'access denied']
+
+# Elements only present on Cloudflare / captcha challenge pages
+BLOCK_PAGE_SELECTOR = (
+    "#challenge-form, #challenge-stage, #cf-challenge-running, [id^='cf-chl'], [class*='cf-chl'], "
+    "iframe[src*='challenges.cloudflare.com'], iframe[src*='recaptcha'], iframe[src*='hcaptcha']"
+)
+
+# A block is only reported when the expected container is missing and a challenge title or element is present
+BLOCK_CHECK_JS = """
+const [expectedSelector, titles, challengeSelector] = arguments;
+if (document.querySelector(expectedSelector)) return false;
+const title = document.title.trim().toLowerCase();
+return titles.includes(title) || document.querySelector(challengeSelector) !== null;
+"""
+
+# Whether any element carries data-lat/data-lng yet
+HAS_COORDINATES_JS = "return document.querySelector('[data-lat][data-lng]') !== null;"
+
+# Explicit chromedriver to launch; when set, Selenium Manager's lookup is skipped on every launch
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH')
+
+def chromedriver_service() -> Optional[Service]:
+    """Service for CHROMEDRIVER_PATH, or None to let Selenium Manager locate a matching driver"""
+    return Service(executable_path=CHROMEDRIVER_PATH) if CHROMEDRIVER_PATH else None
+
+# Resolves true once no DOM mutation has happened for arguments[0] ms, or false at the arguments[1] ms cap
+DOM_IDLE_JS = """
+const [idleMs, capMs, done] = arguments;
+let finished = false, idleTimer;
+const finish = settled => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(idleTimer);
+    clearTimeout(capTimer);
+    done(settled);
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(idleTimer);
+    idleTimer = setTimeout(() => finish(true), idleMs);
+});
+observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+idleTimer = setTimeout(() => finish(true), idleMs);
+const capTimer = setTimeout(() => finish(false), capMs);
+"""
+
+def block_heavy_resources(driver) -> bool:
+    """Block images, fonts, media, ads and trackers for this driver via CDP"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not block resources via CDP: {e}")
+        return False
+
+def is_block_page(driver, expected_selector: str) -> bool:
+    """Whether the driver shows an anti-bot challenge instead of a page matching expected_selector"""
+    try:
+        return bool(driver.execute_script(BLOCK_CHECK_JS, expected_selector, BLOCK_PAGE_TITLES, BLOCK_PAGE_SELECTOR))
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Error checking for a block page: {e}")
+        return False
+
 class HappyCowPageLoader:
     """Handles loading HappyCow searchmap pages and waiting for content"""
     
@@ -27,24 +149,30 @@ class HappyCowPageLoader:
         try:
             chrome_options = Options()
             
+            # Return from driver.get() at DOMContentLoaded; content is awaited explicitly
+            chrome_options.page_load_strategy = 'eager'
+            
             if self.headless:
-                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--headless=new")
             
             # Performance and stability options
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-extensions")
             chrome_options.add_argument("--disable-plugins")
-            chrome_options.add_argument("--disable-images")
             chrome_options.add_argument("--disable-javascript")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+            chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+            
+            # Keep the renderer from decoding images (Chrome has no --disable-images switch)
+            chrome_options.add_experimental_option('prefs', CHROME_PREFS)
+            for arg in CHROME_PERF_ARGS:
+                chrome_options.add_argument(arg)
             
             # Window size
             chrome_options.add_argument("--window-size=1920,1080")
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            self.driver = webdriver.Chrome(options=chrome_options, service=chromedriver_service())
             self.driver.set_page_load_timeout(30)
+            block_heavy_resources(self.driver)
             
             self.logger.info("Chrome WebDriver setup successful")
             return True
@@ -65,8 +193,10 @@ class HappyCowPageLoader:
             # Navigate to the page
             self.driver.get(url)
             
-            # Wait for page to load
-            time.sleep(3)
+            # A block/captcha page never renders the map; fail now instead of waiting out the timeouts
+            if self.is_blocked():
+                self.logger.warning(f"Blocked or captcha page served for: {url}")
+                return False
             
             # Wait for specific elements that indicate content is loaded
             if self._wait_for_content():
@@ -94,13 +224,9 @@ class HappyCowPageLoader:
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".leaflet-container"))
             )
             
-            # Wait for markers or results
+            # Wait for markers or results (one selector list = one query per poll)
             WebDriverWait(self.driver, 10).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".leaflet-marker-icon")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".search-results")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".no-results"))
-                )
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".leaflet-marker-icon, .search-results, .no-results"))
             )
             
             return True
@@ -112,6 +238,75 @@ class HappyCowPageLoader:
             self.logger.warning(f"Error waiting for content: {e}")
             return False
     
+    def wait_for_coordinates(self, timeout: int = 20) -> bool:
+        """Poll until elements carrying data-lat/data-lng are present"""
+        try:
+            if not self.driver:
+                return False
+            
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda d: d.execute_script(HAS_COORDINATES_JS)
+            )
+            return True
+            
+        except TimeoutException:
+            self.logger.warning("Timeout waiting for coordinate attributes")
+            return False
+        except Exception as e:
+            self.logger.warning(f"Error waiting for coordinates: {e}")
+            return False
+    
+    def has_coordinates(self) -> bool:
+        """Check once, without waiting, whether elements carrying data-lat/data-lng are present"""
+        try:
+            return bool(self.driver and self.driver.execute_script(HAS_COORDINATES_JS))
+        except Exception as e:
+            self.logger.warning(f"Error checking for coordinates: {e}")
+            return False
+    
+    def wait_for_stable_count(self, selector: str, polls: int = 3, interval: float = 0.3, timeout: int = 10) -> bool:
+        """Poll until the number of elements matching selector is unchanged for `polls` consecutive polls"""
+        try:
+            if not self.driver:
+                return False
+            
+            history = []
+            
+            def count_is_stable(driver) -> bool:
+                history.append(driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector))
+                return len(history) >= polls and len(set(history[-polls:])) == 1
+            
+            WebDriverWait(self.driver, timeout, poll_frequency=interval).until(count_is_stable)
+            return True
+            
+        except TimeoutException:
+            self.logger.warning(f"Timeout waiting for the '{selector}' count to settle")
+            return False
+        except Exception as e:
+            self.logger.warning(f"Error waiting for the '{selector}' count to settle: {e}")
+            return False
+    
+    def wait_for_dom_idle(self, idle_ms: int = 500, timeout: int = 8) -> bool:
+        """Return once the DOM has gone idle_ms without mutations (capped at timeout seconds)"""
+        try:
+            if not self.driver:
+                return False
+            
+            # Raise the async script timeout for this call only, then put the session's value back
+            previous_timeout = self.driver.timeouts.script
+            self.driver.set_script_timeout(timeout + 2)
+            try:
+                return bool(self.driver.execute_async_script(DOM_IDLE_JS, idle_ms, timeout * 1000))
+            finally:
+                self.driver.set_script_timeout(previous_timeout)
+            
+        except TimeoutException:
+            self.logger.warning("Timeout waiting for the DOM to settle")
+            return False
+        except Exception as e:
+            self.logger.warning(f"Error waiting for the DOM to settle: {e}")
+            return False
+    
     def get_page_source(self) -> Optional[str]:
         """Get the current page source"""
         try:
@@ -132,6 +327,12 @@ class HappyCowPageLoader:
             self.logger.error(f"Error getting page title: {e}")
             return None
     
+    def is_blocked(self) -> bool:
+        """Check whether the current page is an anti-bot challenge rather than the searchmap"""
+        if not self.driver:
+            return False
+        return is_block_page(self.driver, ".leaflet-container")
+    
     def check_for_errors(self) -> bool:
         """Check if the page shows any error messages"""
         try:
@@ -146,13 +347,10 @@ class HappyCowPageLoader:
                 "[class*='error']"
             ]
             
-            for selector in error_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    error_text = elements[0].text.strip()
-                    if error_text:
-                        self.logger.warning(f"Error detected on page: {error_text}")
-                        return True
+            for error_text in self.driver.execute_script(FIRST_TEXTS_JS, error_selectors) or []:
+                if error_text:
+                    self.logger.warning(f"Error detected on page: {error_text}")
+                    return True
             
             return False
             
@@ -166,9 +364,9 @@ class HappyCowPageLoader:
             if not self.driver:
                 return 0
             
-            markers = self.driver.find_elements(By.CSS_SELECTOR, ".leaflet-marker-icon")
-            count = len(markers)
-            self.logger.debug(f"Found {count} markers on page")
+            # Count in the browser rather than marshalling every marker element
+            count = self.driver.execute_script("return document.querySelectorAll('.leaflet-marker-icon').length;")
+            self.logger.debug("Found %d markers on page", count)
             return count
             
         except Exception as e:
@@ -189,13 +387,10 @@ class HappyCowPageLoader:
                 ".total-results"
             ]
             
-            for selector in count_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    text = elements[0].text.strip()
+            for text in self.driver.execute_script(FIRST_TEXTS_JS, count_selectors) or []:
+                if text:
                     # Extract number from text
-                    import re
-                    numbers = re.findall(r'\d+', text)
+                    numbers = INTEGER_PATTERN.findall(text)
                     if numbers:
                         return int(numbers[0])
             
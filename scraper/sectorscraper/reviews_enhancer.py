@@ -3,7 +3,7 @@ ReviewsEnhancer: fetches details from HappyCow reviews page and parses fields
 """
 
 import logging
-import time
+import re
 from typing import Optional, Dict
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -11,6 +11,100 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from .page_loader import (
+    CHROME_PERF_ARGS, CHROME_PREFS, block_heavy_resources, chromedriver_service, is_block_page
+)
+
+DECIMAL_PATTERN = re.compile(r"\d+\.?\d*", re.ASCII)
+INTEGER_PATTERN = re.compile(r"\d+", re.ASCII)
+
+# Paint attributes of every SVG under div[title=<title>], per title, in one round-trip
+SVG_PAINT_SNAPSHOT_JS = """
+return arguments[0].map(title => Array.from(document.querySelectorAll('div[title="' + title + '"] svg')).map(svg => ({
+    class_name: svg.getAttribute('class') || '',
+    fill: svg.getAttribute('fill') || '',
+    style: svg.getAttribute('style') || '',
+    computed_fill: window.getComputedStyle(svg).fill || '',
+    child_paints: Array.from(svg.getElementsByTagName('*'))
+        .map(c => [c.getAttribute('fill') || '', c.getAttribute('style') || ''])
+})));
+"""
+
+# Any of these marks a rendered venue page
+VENUE_CONTENT_SELECTOR = ".venue-description, .venue-info, [itemprop='streetAddress'], #listing-images"
+
+# Rendered text of elements (mirrors WebElement.text: unrendered elements yield '')
+_TEXT_JS = "const text = el => (el.getClientRects().length ? el.innerText : '').trim();\n"
+
+# First non-empty text across the selectors, in priority order
+_FIRST_TEXT_JS = _TEXT_JS + """
+const firstText = sels => {
+    for (const sel of sels) {
+        let els;
+        try { els = document.querySelectorAll(sel); } catch (e) { continue; }
+        for (const el of els) {
+            const t = text(el);
+            if (t) return t;
+        }
+    }
+    return null;
+};
+"""
+
+# First text for every field of a {field: selectors} map, in one round-trip
+FIRST_TEXTS_BY_FIELD_JS = _FIRST_TEXT_JS + """
+const out = {};
+for (const [field, sels] of Object.entries(arguments[0])) out[field] = firstText(sels);
+return out;
+"""
+
+# Text-only fields of a venue page, selectors in priority order
+TEXT_FIELD_SELECTORS = {
+    'phone': ["a[href^='tel:']", ".phone, .tel"],
+    'street': ["[itemprop='streetAddress']"],
+    'postal': ["[itemprop='postalCode']"],
+    'address': [".address, .venue-address, .business-address, .location"],
+    'description': [".venue-description", ".description, .about, .summary, .details"],
+    'cuisine': [".cuisine, .cuisine-type, .food-type, .category"],
+    'price': [".price, .price-range, .cost, .budget"],
+    'rating': [".rating, .avg-rating, .stars, .score"],
+    'review_count': [".review-count, .reviews-count, .reviews-total"],
+    'hours': [".hours-summary", ".hours, .opening-hours, .schedule, .time"],
+}
+
+# Texts of every element matching each selector, selectors kept in priority order, in one round-trip
+ALL_TEXTS_JS = _TEXT_JS + "return arguments[0].flatMap(sel => Array.from(document.querySelectorAll(sel)).map(text));"
+
+# Listing type, rating and review count in one round-trip (content attribute first, then text; null when absent)
+STRUCTURED_ATTRS_JS = _TEXT_JS + """
+const contentOrText = sel => {
+    const el = document.querySelector(sel);
+    return el ? (el.getAttribute('content') || text(el)) : null;
+};
+const listing = document.querySelector('[data-listing-type]');
+return {
+    listing_type: listing ? listing.getAttribute('data-listing-type') : null,
+    rating: contentOrText("[itemprop='ratingValue']"),
+    review_count: contentOrText("[itemprop='reviewCount']"),
+};
+"""
+
+# Texts of the flex items inside .venue-info, skipping any item that sits within
+# `hops` levels of an excluded container, in one round-trip
+VENUE_FEATURES_JS = _TEXT_JS + """
+const excluded = arguments[0];
+const hops = arguments[1];
+const isExcluded = el => {
+    for (let current = el, i = 0; current && i < hops; i++, current = current.parentElement) {
+        if (excluded.some(c => current.classList && current.classList.contains(c))) return true;
+    }
+    return false;
+};
+return Array.from(document.querySelectorAll('.venue-info'))
+    .flatMap(block => Array.from(block.querySelectorAll('div, span')))
+    .filter(el => !isExcluded(el))
+    .map(text);
+"""
 
 
 class ReviewsEnhancer:
@@ -18,15 +112,26 @@ class ReviewsEnhancer:
         self.logger = logging.getLogger(__name__)
         self.timeout = timeout
         chrome_options = Options()
+        # Return from driver.get() at DOMContentLoaded; fetch_details waits for the body itself
+        chrome_options.page_load_strategy = 'eager'
         if headless:
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--incognito")
         chrome_options.add_argument("--log-level=3")
-        self.driver = webdriver.Chrome(options=chrome_options)
+        chrome_options.add_experimental_option('prefs', CHROME_PREFS)
+        for arg in CHROME_PERF_ARGS:
+            chrome_options.add_argument(arg)
+        self.driver = webdriver.Chrome(options=chrome_options, service=chromedriver_service())
+        # Fail a stalled navigation after the wait timeout instead of WebDriver's 300s default
+        self.driver.set_page_load_timeout(timeout)
+        # Waits hold no per-call state, so one of each serves every fetch_details call
+        self._body_wait = WebDriverWait(self.driver, timeout)
+        self._content_wait = WebDriverWait(self.driver, 2, poll_frequency=0.1)
+        # Image URLs are read from src attributes, so the bytes themselves are not needed
+        block_heavy_resources(self.driver)
 
     def close(self):
         try:
@@ -37,10 +142,20 @@ class ReviewsEnhancer:
     def fetch_details(self, url: str) -> Optional[Dict]:
         try:
             self.driver.get(url)
-            WebDriverWait(self.driver, self.timeout).until(
+            self._body_wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
             )
-            time.sleep(1)
+            # Skip the content wait and parsing on a block/captcha page
+            if is_block_page(self.driver, VENUE_CONTENT_SELECTOR):
+                self.logger.warning(f"Blocked or captcha page served for: {url}")
+                return None
+            # Give client-side rendering until the venue content shows up instead of a fixed pause
+            try:
+                self._content_wait.until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, VENUE_CONTENT_SELECTOR))
+                )
+            except TimeoutException:
+                self.logger.debug("Venue content not detected on %s; parsing what is loaded", url)
             return self._parse_page()
         except TimeoutException:
             self.logger.warning(f"Timeout loading reviews page: {url}")
@@ -65,53 +180,41 @@ class ReviewsEnhancer:
         }
 
         try:
-            # Common selectors on HappyCow venue pages
+            # Every text field resolved in one round-trip; fallbacks below just pick from it
+            try:
+                texts = self.driver.execute_script(FIRST_TEXTS_BY_FIELD_JS, TEXT_FIELD_SELECTORS) or {}
+            except Exception:
+                texts = {}
+
             # Phone
-            tel = self._first_text([
-                "a[href^='tel:']",
-                ".phone, .tel",
-            ])
-            if tel:
-                d['phone'] = tel
+            if texts.get('phone'):
+                d['phone'] = texts['phone']
 
             # Address: concatenate itemprop streetAddress + postalCode if present
-            try:
-                street = self._first_text(["[itemprop='streetAddress']"]) or ""
-                postal = self._first_text(["[itemprop='postalCode']"]) or ""
-                if street or postal:
-                    d['address'] = (street + (" " if street and postal else "") + postal).strip()
-            except Exception:
-                pass
+            street = texts.get('street') or ""
+            postal = texts.get('postal') or ""
+            if street or postal:
+                d['address'] = (street + (" " if street and postal else "") + postal).strip()
             # Fallback generic address containers if itemprops missing
-            if not d['address']:
-                addr = self._first_text([
-                    ".address, .venue-address, .business-address, .location",
-                ])
-                if addr:
-                    d['address'] = addr
+            if not d['address'] and texts.get('address'):
+                d['address'] = texts['address']
 
             # Description/About (prefer venue-description)
-            desc = self._first_text([
-                ".venue-description",
-                ".description, .about, .summary, .details"
-            ])
-            if desc:
-                d['description'] = desc
+            if texts.get('description'):
+                d['description'] = texts['description']
 
-            # Category (from data-listing-type attribute or visible labels)
+            # Structured attributes (listing type, rating, review count) in one round-trip
             try:
-                cat_el = self.driver.find_element(By.CSS_SELECTOR, "[data-listing-type]")
-                val = (cat_el.get_attribute('data-listing-type') or '').strip()
-                if val:
-                    d['category'] = val
+                structured = self.driver.execute_script(STRUCTURED_ATTRS_JS) or {}
             except Exception:
-                pass
-            if not d['category']:
-                cuisine = self._first_text([
-                    ".cuisine, .cuisine-type, .food-type, .category"
-                ])
-                if cuisine:
-                    d['category'] = cuisine
+                structured = {}
+
+            # Category (from data-listing-type attribute or visible labels)
+            val = (structured.get('listing_type') or '').strip()
+            if val:
+                d['category'] = val
+            if not d['category'] and texts.get('cuisine'):
+                d['category'] = texts['cuisine']
 
             # Price range - check for colored SVG icons in title divs
             price_range = self._extract_price_range_from_icons()
@@ -119,66 +222,41 @@ class ReviewsEnhancer:
                 d['price_range'] = price_range
             else:
                 # Fallback to text-based extraction
-                price = self._first_text([
-                    ".price, .price-range, .cost, .budget"
-                ])
-                if price:
-                    d['price_range'] = price
+                if texts.get('price'):
+                    d['price_range'] = texts['price']
 
             # Rating and reviews
             # Rating: prefer itemprop content attribute
-            rating_el = None
-            try:
-                rating_el = self.driver.find_element(By.CSS_SELECTOR, "[itemprop='ratingValue']")
-            except Exception:
-                rating_el = None
-            if rating_el:
-                content = (rating_el.get_attribute('content') or rating_el.text or '').strip()
-                if content:
-                    try:
-                        d['rating'] = float(content)
-                    except Exception:
-                        pass
+            content = (structured.get('rating') or '').strip()
+            if content:
+                try:
+                    d['rating'] = float(content)
+                except Exception:
+                    pass
             if d['rating'] is None:
-                rating_text = self._first_text([
-                    ".rating, .avg-rating, .stars, .score"
-                ])
+                rating_text = texts.get('rating')
                 if rating_text:
-                    import re
-                    nums = re.findall(r"\d+\.?\d*", rating_text)
+                    nums = DECIMAL_PATTERN.findall(rating_text)
                     if nums:
                         d['rating'] = float(nums[0])
 
             # Review count: prefer itemprop content attribute
-            count_el = None
-            try:
-                count_el = self.driver.find_element(By.CSS_SELECTOR, "[itemprop='reviewCount']")
-            except Exception:
-                count_el = None
-            if count_el:
-                content = (count_el.get_attribute('content') or count_el.text or '').strip()
-                if content:
-                    try:
-                        d['review_count'] = int(''.join(ch for ch in content if ch.isdigit()))
-                    except Exception:
-                        pass
+            content = (structured.get('review_count') or '').strip()
+            if content:
+                try:
+                    d['review_count'] = int(''.join(ch for ch in content if ch.isdigit()))
+                except Exception:
+                    pass
             if d['review_count'] is None:
-                reviews_text = self._first_text([
-                    ".review-count, .reviews-count, .reviews-total"
-                ])
+                reviews_text = texts.get('review_count')
                 if reviews_text:
-                    import re
-                    nums = re.findall(r"\d+", reviews_text)
+                    nums = INTEGER_PATTERN.findall(reviews_text)
                     if nums:
                         d['review_count'] = int(nums[0])
 
             # Hours - prioritize hours-summary class
-            hours = self._first_text([
-                ".hours-summary",  # Primary selector for hours
-                ".hours, .opening-hours, .schedule, .time"  # Fallback selectors
-            ])
-            if hours:
-                d['hours'] = hours
+            if texts.get('hours'):
+                d['hours'] = texts['hours']
 
             # Images - extract restaurant image URLs
             images = self._extract_restaurant_images()
@@ -188,22 +266,15 @@ class ReviewsEnhancer:
             # Features: prefer venue-info flex divs, fallback to previous badges
             features_vals = []
             try:
-                venue_info = self.driver.find_elements(By.CSS_SELECTOR, ".venue-info")
-                for block in venue_info:
-                    items = block.find_elements(By.CSS_SELECTOR, "div, span")
-                    for it in items:
-                        # Skip if element or any ancestor is an excluded container
-                        if self._has_excluded_ancestor(it, {"venue-info-container", "venue-description"}):
-                            continue
-                        txt = it.text.strip()
-                        if txt:
-                            features_vals.append(txt)
+                venue_texts = self.driver.execute_script(
+                    VENUE_FEATURES_JS, ["venue-info-container", "venue-description"], 6
+                ) or []
+                features_vals = [t for t in venue_texts if t]
             except Exception:
                 pass
             if not features_vals:
-                features_els = self.driver.find_elements(By.CSS_SELECTOR, ".features .feature, .tags .tag, .amenities .amenity")
-                if features_els:
-                    features_vals = [e.text.strip() for e in features_els if e.text.strip()]
+                features_texts = self.driver.execute_script(ALL_TEXTS_JS, [".features .feature, .tags .tag, .amenities .amenity"]) or []
+                features_vals = [t for t in features_texts if t]
             if features_vals:
                 # Deduplicate while preserving order
                 seen = set()
@@ -215,7 +286,7 @@ class ReviewsEnhancer:
                 d['features'] = uniq
 
         except Exception as e:
-            self.logger.debug(f"Parse page encountered issues: {e}")
+            self.logger.debug("Parse page encountered issues: %s", e)
 
         return d
 
@@ -224,35 +295,22 @@ class ReviewsEnhancer:
         try:
             image_urls = []
             
-            # Primary method: Look for images in the specific listing-images div
+            # Primary method: images in the listing-images div (venue-list-images first,
+            # then any other img in the div), with every src read in one round-trip
             try:
-                listing_images_div = self.driver.find_element(By.ID, "listing-images")
-                if listing_images_div:
-                    # Look for images within venue-list-images divs
-                    venue_image_divs = listing_images_div.find_elements(By.CSS_SELECTOR, ".venue-list-images")
-                    
-                    for venue_div in venue_image_divs:
-                        # Look for img tags within each venue-list-images div
-                        images = venue_div.find_elements(By.CSS_SELECTOR, "img")
-                        for img in images:
-                            src = img.get_attribute('src')
-                            if src and self._is_valid_image_url(src):
-                                # Convert relative URLs to absolute URLs
-                                absolute_src = self._make_absolute_url(src)
-                                if absolute_src and absolute_src not in image_urls:
-                                    image_urls.append(absolute_src)
-                    
-                    # Also look for any other images within the listing-images div
-                    all_images = listing_images_div.find_elements(By.CSS_SELECTOR, "img")
-                    for img in all_images:
-                        src = img.get_attribute('src')
-                        if src and self._is_valid_image_url(src):
-                            absolute_src = self._make_absolute_url(src)
-                            if absolute_src and absolute_src not in image_urls:
-                                image_urls.append(absolute_src)
+                primary_srcs = self.driver.execute_script(
+                    "return ['#listing-images .venue-list-images img', '#listing-images img']"
+                    ".flatMap(sel => Array.from(document.querySelectorAll(sel)).map(img => img.src));"
+                ) or []
+                for src in primary_srcs:
+                    if src and self._is_valid_image_url(src):
+                        # Convert relative URLs to absolute URLs
+                        absolute_src = self._make_absolute_url(src)
+                        if absolute_src and absolute_src not in image_urls:
+                            image_urls.append(absolute_src)
                                 
             except Exception as e:
-                self.logger.debug(f"Could not find listing-images div: {e}")
+                self.logger.debug("Could not read listing-images sources: %s", e)
             
             # Fallback method: Use broader selectors if listing-images div not found
             if not image_urls:
@@ -271,24 +329,26 @@ class ReviewsEnhancer:
                     "img[alt*='venue']"        # Images with venue in alt text
                 ]
                 
-                for selector in fallback_selectors:
-                    try:
-                        images = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for img in images:
-                            src = img.get_attribute('src')
-                            if src and self._is_valid_image_url(src):
-                                absolute_src = self._make_absolute_url(src)
-                                if absolute_src and absolute_src not in image_urls:
-                                    image_urls.append(absolute_src)
-                                    
-                    except Exception:
-                        continue
+                try:
+                    fallback_srcs = self.driver.execute_script(
+                        "return arguments[0].flatMap(sel => {"
+                        " try { return Array.from(document.querySelectorAll(sel)).map(img => img.src); }"
+                        " catch (e) { return []; } });",
+                        fallback_selectors
+                    ) or []
+                except Exception:
+                    fallback_srcs = []
+                for src in fallback_srcs:
+                    if src and self._is_valid_image_url(src):
+                        absolute_src = self._make_absolute_url(src)
+                        if absolute_src and absolute_src not in image_urls:
+                            image_urls.append(absolute_src)
             
             # Limit to reasonable number of images (max 10)
             return image_urls[:10] if image_urls else []
             
         except Exception as e:
-            self.logger.debug(f"Error extracting restaurant images: {e}")
+            self.logger.debug("Error extracting restaurant images: %s", e)
             return []
 
     def _make_absolute_url(self, url):
@@ -337,23 +397,18 @@ class ReviewsEnhancer:
             # Look for divs with title attributes for price ranges
             price_titles = ["Inexpensive", "Moderate", "Expensive"]
             
-            for title in price_titles:
-                try:
-                    # Find div with specific title attribute
-                    divs = self.driver.find_elements(By.CSS_SELECTOR, f"div[title='{title}']")
-                    
-                    for div in divs:
-                        # Look for SVG icon within this div
-                        svg_icons = div.find_elements(By.CSS_SELECTOR, "svg")
-                        
-                        for svg in svg_icons:
-                            # Check if SVG is colored yellow (indicating selected)
-                            if self._is_svg_colored_yellow(svg):
-                                self.logger.debug(f"Found price range: {title}")
-                                return title
-                                
-                except Exception:
-                    continue
+            # Snapshot the paint attributes of every SVG icon under each title div in one round-trip
+            try:
+                svgs_by_title = self.driver.execute_script(SVG_PAINT_SNAPSHOT_JS, price_titles) or []
+            except Exception:
+                svgs_by_title = []
+            
+            for title, svg_icons in zip(price_titles, svgs_by_title):
+                for svg in svg_icons:
+                    # Check if SVG is colored yellow (indicating selected)
+                    if self._is_svg_colored_yellow(svg):
+                        self.logger.debug("Found price range: %s", title)
+                        return title
             
             # Alternative approach: look for any div with price-related classes or attributes
             try:
@@ -366,17 +421,15 @@ class ReviewsEnhancer:
                     ".cost-range"
                 ]
                 
-                for selector in price_selectors:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        # Check if this element contains price range text
-                        text = element.text.strip().lower()
-                        if 'inexpensive' in text:
-                            return 'Inexpensive'
-                        elif 'moderate' in text:
-                            return 'Moderate'
-                        elif 'expensive' in text:
-                            return 'Expensive'
+                for text in self.driver.execute_script(ALL_TEXTS_JS, price_selectors) or []:
+                    # Check if this element contains price range text
+                    text = text.lower()
+                    if 'inexpensive' in text:
+                        return 'Inexpensive'
+                    elif 'moderate' in text:
+                        return 'Moderate'
+                    elif 'expensive' in text:
+                        return 'Expensive'
                             
             except Exception:
                 pass
@@ -384,14 +437,14 @@ class ReviewsEnhancer:
             return None
             
         except Exception as e:
-            self.logger.debug(f"Error extracting price range from icons: {e}")
+            self.logger.debug("Error extracting price range from icons: %s", e)
             return None
 
-    def _is_svg_colored_yellow(self, svg_element):
-        """Check if SVG element is colored yellow (indicating it's selected)"""
+    def _is_svg_colored_yellow(self, svg: Dict):
+        """Check if an SVG paint snapshot (see SVG_PAINT_SNAPSHOT_JS) is colored yellow (indicating it's selected)"""
         try:
             # Check for yellow CSS classes (Tailwind CSS style)
-            class_name = svg_element.get_attribute('class') or ''
+            class_name = svg.get('class_name') or ''
             class_lower = class_name.lower()
             
             # Check for yellow color classes
@@ -425,43 +478,34 @@ class ReviewsEnhancer:
             ]
             
             # 1. Check fill attribute
-            fill = svg_element.get_attribute('fill')
+            fill = svg.get('fill')
             if fill:
                 fill_lower = fill.lower()
                 if any(color in fill_lower for color in yellow_colors):
                     return True
             
             # 2. Check style attribute
-            style = svg_element.get_attribute('style')
+            style = svg.get('style')
             if style:
                 style_lower = style.lower()
                 if any(color in style_lower for color in yellow_colors):
                     return True
             
             # 3. Check computed style (more reliable)
-            try:
-                computed_style = self.driver.execute_script(
-                    "return window.getComputedStyle(arguments[0]).fill;", 
-                    svg_element
-                )
-                if computed_style:
-                    computed_lower = computed_style.lower()
-                    if any(color in computed_lower for color in yellow_colors):
-                        return True
-            except Exception:
-                pass
+            computed_style = svg.get('computed_fill')
+            if computed_style:
+                computed_lower = computed_style.lower()
+                if any(color in computed_lower for color in yellow_colors):
+                    return True
             
             # 4. Check for yellow color in any child elements
-            child_elements = svg_element.find_elements(By.CSS_SELECTOR, "*")
-            for child in child_elements:
-                child_fill = child.get_attribute('fill')
+            for child_fill, child_style in svg.get('child_paints') or []:
                 if child_fill:
                     child_fill_lower = child_fill.lower()
                     if any(color in child_fill_lower for color in yellow_colors):
                         return True
                         
                 # Also check child style
-                child_style = child.get_attribute('style')
                 if child_style:
                     child_style_lower = child_style.lower()
                     if any(color in child_style_lower for color in yellow_colors):
@@ -475,35 +519,3 @@ class ReviewsEnhancer:
             
         except Exception:
             return False
-
-    def _first_text(self, selectors):
-        for css in selectors:
-            try:
-                els = self.driver.find_elements(By.CSS_SELECTOR, css)
-                for el in els:
-                    t = el.text.strip()
-                    if t:
-                        return t
-            except Exception:
-                continue
-        return None
-
-    def _has_excluded_ancestor(self, element, excluded_classes: set) -> bool:
-        try:
-            current = element
-            max_hops = 6
-            hops = 0
-            while current is not None and hops < max_hops:
-                cls = (current.get_attribute('class') or '').split()
-                if any(c in excluded_classes for c in cls):
-                    return True
-                try:
-                    current = current.find_element(By.XPATH, "..")
-                except Exception:
-                    break
-                hops += 1
-            return False
-        except Exception:
-            return False
-
-
@@ -5,25 +5,33 @@ Coordinates the scraping of all 48 sectors
 
 import time
 import logging
-from typing import List, Dict, Optional
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Set
 from .sector_grid import SingaporeSectorGrid
 from .url_generator import HappyCowURLGenerator
-from .page_loader import HappyCowPageLoader
+from .page_loader import HappyCowPageLoader, USER_AGENT
 from .data_extractor import HappyCowDataExtractor
 from .session_manager import ScrapingSessionManager
+from config import Config
 
 class HappyCowSectorScraper:
     """Main scraper that coordinates scraping all sectors"""
     
-    def __init__(self, headless: bool = True, delay_between_sectors: int = 2):
+    def __init__(self, headless: bool = True, delay_between_sectors: int = 2, use_static_fetch: bool = True):
         self.logger = logging.getLogger(__name__)
         self.headless = headless
         self.delay_between_sectors = delay_between_sectors
+        self.use_static_fetch = use_static_fetch
         
         # Initialize components
         self.sector_grid = SingaporeSectorGrid()
         self.url_generator = HappyCowURLGenerator()
         self.page_loader = HappyCowPageLoader(headless=headless)
+        self.http = self._build_http_session()
         
         # Scraping state
         self.scraped_sectors = []
@@ -33,6 +41,31 @@ class HappyCowSectorScraper:
         # Session management
         self.session_manager: Optional[ScrapingSessionManager] = None
         self.current_session_id: Optional[str] = None
+        
+        # Database connection, created on first save and reused for every sector
+        self._db_manager = None
+    
+    def _build_http_session(self) -> requests.Session:
+        """Pooled session for static fetches: keep-alive connections shared by worker threads, retried by urllib3"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        retry = Retry(
+            total=Config.MAX_RETRIES,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({'GET'})
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _get_db_manager(self):
+        """Get the shared DatabaseManager, connecting on first use"""
+        if self._db_manager is None:
+            from database import DatabaseManager
+            self._db_manager = DatabaseManager()
+        return self._db_manager
     
     def _setup_session_manager(self, db_manager) -> bool:
         """Setup session manager for progress tracking"""
@@ -80,9 +113,7 @@ class HappyCowSectorScraper:
             
             # Setup session management if save_to_db is enabled
             if save_to_db and not self.session_manager:
-                from database import DatabaseManager
-                db_manager = DatabaseManager()
-                if not self._setup_session_manager(db_manager):
+                if not self._setup_session_manager(self._get_db_manager()):
                     self.logger.warning("Failed to setup session manager, continuing without progress tracking")
             
             # Handle session resume or start new session
@@ -109,6 +140,8 @@ class HappyCowSectorScraper:
             self.logger.info(f"Scraping {len(sectors)} sectors (starting from sector {start_sector + 1})")
             
             all_restaurants = []
+            # Coordinates already collected; neighbouring sectors overlap, so most pages repeat venues
+            seen_coords: Set[tuple] = set()
             
             for i, sector in enumerate(sectors):
                 sector_num = start_sector + i + 1
@@ -119,18 +152,19 @@ class HappyCowSectorScraper:
                     sector_restaurants = self._scrape_single_sector(sector)
                     
                     if sector_restaurants:
-                        all_restaurants.extend(sector_restaurants)
+                        new_restaurants = self._take_new_restaurants(sector_restaurants, seen_coords)
+                        all_restaurants.extend(new_restaurants)
                         self.scraped_sectors.append(sector)
-                        self.total_restaurants += len(sector_restaurants)
-                        self.logger.info(f"Sector {sector_num} completed: {len(sector_restaurants)} restaurants")
+                        self.total_restaurants += len(new_restaurants)
+                        self.logger.info(f"Sector {sector_num} completed: {len(sector_restaurants)} restaurants ({len(new_restaurants)} new)")
                         
-                        # Save to database immediately if requested
-                        if save_to_db:
-                            self._save_sector_to_database(sector_restaurants, sector_num)
+                        # Save to database immediately if requested (overlap is already filtered out)
+                        if save_to_db and new_restaurants:
+                            self._save_sector_to_database(new_restaurants, sector_num)
                         
                         # Update session progress
                         if self.session_manager:
-                            self.session_manager.update_sector_progress(sector_num, 'completed', len(sector_restaurants))
+                            self.session_manager.update_sector_progress(sector_num, 'completed', len(new_restaurants))
                     else:
                         self.logger.warning(f"Sector {sector_num} returned no restaurants")
                         self.failed_sectors.append(sector)
@@ -165,12 +199,94 @@ class HappyCowSectorScraper:
         finally:
             self.page_loader.close_driver()
     
+    def _take_new_restaurants(self, restaurants: List[Dict], seen_coords: Set[tuple]) -> List[Dict]:
+        """Return restaurants whose coordinates are not yet in seen_coords, recording them as seen"""
+        new_restaurants = []
+        for restaurant in restaurants:
+            coord_key = (restaurant.get('latitude'), restaurant.get('longitude'))
+            if coord_key not in seen_coords:
+                seen_coords.add(coord_key)
+                new_restaurants.append(restaurant)
+        return new_restaurants
+    
     def scrape_single_sector(self, sector: Dict) -> List[Dict]:
         """Scrape a single sector"""
         return self._scrape_single_sector(sector)
     
-    def _scrape_single_sector(self, sector: Dict) -> List[Dict]:
-        """Internal method to scrape a single sector"""
+    def scrape_sectors_concurrently(self, sectors: List[Dict], max_workers: int = 3, save_to_db: bool = False, start_sector: int = 0) -> List[Dict]:
+        """Scrape independent sectors in parallel, at most one Chrome session per worker thread
+
+        sectors is the grid slice beginning at start_sector, which keeps sector numbers global.
+        """
+        thread_state = threading.local()
+        loaders: List[HappyCowPageLoader] = []
+        loaders_lock = threading.Lock()
+        
+        def worker_loader() -> HappyCowPageLoader:
+            # WebDriver sessions are not shared across threads; a worker gets its own
+            # loader only once a sector actually needs the browser
+            loader = getattr(thread_state, 'loader', None)
+            if loader is None:
+                loader = HappyCowPageLoader(headless=self.headless)
+                thread_state.loader = loader
+                with loaders_lock:
+                    loaders.append(loader)
+            return loader
+        
+        def scrape(sector: Dict) -> List[Dict]:
+            try:
+                return self._scrape_single_sector(sector, worker_loader)
+            finally:
+                # Pace each browser the same way the sequential loop does
+                time.sleep(self.delay_between_sectors)
+        
+        if save_to_db and not self.session_manager:
+            if not self._setup_session_manager(self._get_db_manager()):
+                self.logger.warning("Failed to setup session manager, continuing without progress tracking")
+        if save_to_db and self.session_manager:
+            if not self.start_new_session(len(sectors), start_sector):
+                self.logger.warning("Failed to start new session, continuing without progress tracking")
+        
+        all_restaurants = []
+        seen_coords: Set[tuple] = set()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for i, (sector, sector_restaurants) in enumerate(zip(sectors, executor.map(scrape, sectors))):
+                    sector_num = start_sector + i + 1
+                    if sector_restaurants:
+                        # Results arrive on the calling thread, so seen_coords needs no lock
+                        new_restaurants = self._take_new_restaurants(sector_restaurants, seen_coords)
+                        all_restaurants.extend(new_restaurants)
+                        self.scraped_sectors.append(sector)
+                        self.total_restaurants += len(new_restaurants)
+                        self.logger.info(f"Sector {sector_num} completed: {len(sector_restaurants)} restaurants ({len(new_restaurants)} new)")
+                        
+                        if save_to_db and new_restaurants:
+                            self._save_sector_to_database(new_restaurants, sector_num)
+                        
+                        if self.session_manager:
+                            self.session_manager.update_sector_progress(sector_num, 'completed', len(new_restaurants))
+                    else:
+                        self.logger.warning(f"Sector {sector_num} returned no restaurants")
+                        self.failed_sectors.append(sector)
+                        
+                        if self.session_manager:
+                            self.session_manager.update_sector_progress(sector_num, 'failed', 0)
+            
+            if self.session_manager:
+                self.session_manager.complete_session()
+            
+            self.logger.info(f"Concurrent scraping completed: {len(all_restaurants)} restaurants from {len(sectors)} sectors")
+            return all_restaurants
+        finally:
+            for loader in loaders:
+                loader.close_driver()
+    
+    def _scrape_single_sector(self, sector: Dict, get_page_loader: Optional[Callable[[], HappyCowPageLoader]] = None) -> List[Dict]:
+        """Internal method to scrape a single sector
+
+        get_page_loader is only called when the static fetch yields nothing (defaults to self.page_loader).
+        """
         try:
             # Generate URL for this sector
             url = self.url_generator.generate_sector_url(sector)
@@ -178,13 +294,26 @@ class HappyCowSectorScraper:
                 self.logger.error(f"Failed to generate URL for sector {sector['name']}")
                 return []
             
+            # Try the server-rendered HTML first; fall back to the browser if it yields nothing
+            if self.use_static_fetch:
+                restaurants = self._scrape_sector_static(url)
+                if restaurants:
+                    self.logger.info(f"Extracted {len(restaurants)} restaurants from {sector['name']} (static HTML)")
+                    return restaurants
+            
             # Load the page
-            if not self.page_loader.load_sector_page(url):
+            page_loader = get_page_loader() if get_page_loader else self.page_loader
+            if not page_loader.load_sector_page(url):
                 self.logger.error(f"Failed to load page for sector {sector['name']}")
                 return []
             
+            # Cards carrying coordinates usually render with the markers; only when they lag
+            # behind does it pay to poll until the card count settles
+            if not page_loader.has_coordinates():
+                page_loader.wait_for_stable_count('[data-marker-id]', polls=2)
+            
             # Extract restaurant data
-            extractor = HappyCowDataExtractor(self.page_loader.driver)
+            extractor = HappyCowDataExtractor(page_loader.driver)
             restaurants = extractor.extract_restaurants_from_page()
             
             if restaurants:
@@ -198,13 +327,22 @@ class HappyCowSectorScraper:
             self.logger.error(f"Error scraping sector {sector['name']}: {e}")
             return []
     
+    def _scrape_sector_static(self, url: str) -> List[Dict]:
+        """Fetch a sector page over plain HTTP and parse its server-rendered cards"""
+        try:
+            response = self.http.get(url, timeout=15)
+            response.raise_for_status()
+            return HappyCowDataExtractor(None).extract_restaurants_from_html(response.content)
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Static fetch failed, falling back to browser: {e}")
+            return []
+    
     def _save_sector_to_database(self, restaurants: List[Dict], sector_num: int) -> bool:
         """Save a sector's restaurants to the database immediately"""
         try:
-            from database import DatabaseManager
             from models import Restaurant
             
-            db_manager = DatabaseManager()
+            db_manager = self._get_db_manager()
             if not db_manager.supabase:
                 self.logger.error("No database connection available")
                 return False
@@ -233,7 +371,7 @@ class HappyCowSectorScraper:
                     )
                     restaurant_models.append(restaurant)
                 except Exception as e:
-                    self.logger.warning(f"Skipping invalid restaurant data: {e}")
+                    self.logger.warning("Skipping invalid restaurant data: %s", e)
                     continue
             
             if not restaurant_models:
@@ -268,6 +406,9 @@ class HappyCowSectorScraper:
             self.logger.info(f"Found {len(sectors)} sectors in {region}")
             
             all_restaurants = []
+            # Region sectors are scattered across the grid; number them by grid position
+            grid_numbers = {s['id']: n for n, s in enumerate(self.sector_grid.generate_sectors(), start=1)}
+            seen_coords: Set[tuple] = set()
             
             for i, sector in enumerate(sectors):
                 self.logger.info(f"Processing {region} sector {i+1}/{len(sectors)}: {sector['name']}")
@@ -275,13 +416,14 @@ class HappyCowSectorScraper:
                 try:
                     sector_restaurants = self._scrape_single_sector(sector)
                     if sector_restaurants:
-                        all_restaurants.extend(sector_restaurants)
+                        new_restaurants = self._take_new_restaurants(sector_restaurants, seen_coords)
+                        all_restaurants.extend(new_restaurants)
                         self.scraped_sectors.append(sector)
-                        self.total_restaurants += len(sector_restaurants)
+                        self.total_restaurants += len(new_restaurants)
                         
-                        # Save to database immediately if requested
-                        if save_to_db:
-                            self._save_sector_to_database(sector_restaurants, i+1)
+                        # Save to database immediately if requested (overlap is already filtered out)
+                        if save_to_db and new_restaurants:
+                            self._save_sector_to_database(new_restaurants, grid_numbers.get(sector['id'], i+1))
                     
                     # Delay between sectors
                     if i < len(sectors) - 1:
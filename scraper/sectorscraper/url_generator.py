@@ -4,6 +4,7 @@ Generates search URLs for each sector with proper parameters
 """
 
 from typing import Dict, List
+from urllib.parse import urlencode, urlsplit, parse_qsl
 import logging
 
 class HappyCowURLGenerator:
@@ -25,14 +26,18 @@ class HappyCowURLGenerator:
             'limit': '81',  # Maximum results per sector
             'order': 'default'  # Sort order
         }
+        
+        # Static parts of the query string, encoded once; only lat/lng vary per sector
+        self._query_prefix = f"{self.base_url}?" + urlencode({k: self.default_params[k] for k in ('s', 'location')})
+        self._query_suffix = "&" + urlencode({k: self.default_params[k] for k in ('page', 'zoom', 'metric', 'limit', 'order')})
     
     def generate_sector_url(self, sector: Dict) -> str:
         """Generate search URL for a specific sector"""
         try:
             # Build URL with sector coordinates
-            url = f"{self.base_url}?s={self.default_params['s']}&location={self.default_params['location']}&lat={sector['lat_center']}&lng={sector['lng_center']}&page={self.default_params['page']}&zoom={self.default_params['zoom']}&metric={self.default_params['metric']}&limit={self.default_params['limit']}&order={self.default_params['order']}"
+            url = f"{self._query_prefix}&lat={sector['lat_center']}&lng={sector['lng_center']}{self._query_suffix}"
             
-            self.logger.debug(f"Generated URL for {sector['name']}: {url}")
+            self.logger.debug("Generated URL for %s: %s", sector['name'], url)
             return url
             
         except Exception as e:
@@ -72,19 +77,8 @@ class HappyCowURLGenerator:
     def get_url_parameters(self, url: str) -> Dict:
         """Extract parameters from a URL"""
         try:
-            # Split URL and extract query parameters
-            if '?' in url:
-                query_string = url.split('?')[1]
-                params = {}
-                
-                for param in query_string.split('&'):
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        params[key] = value
-                
-                return params
-            else:
-                return {}
+            # Decode the query string (keeps empty values such as location=)
+            return dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
                 
         except Exception as e:
             self.logger.error(f"Error parsing URL parameters: {e}")
@@ -56,3 +56,167 @@ def test_insert_restaurants(mock_create_client, sample_restaurant_data):
     assert success is True
     assert inserted_count == 1
     assert skipped_count == 0
+
+@patch('database.create_client')
+def test_check_restaurants_exist(mock_create_client, sample_restaurant_data):
+    """Test bulk existence check by coordinates, then name and address"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    
+    coords_response = Mock()
+    coords_response.data = [{'latitude': 1.3521, 'longitude': 103.8198}]
+    names_response = Mock()
+    names_response.data = [{'name': 'Known Cafe', 'address': '1 Known Road'}]
+    mock_client.table.return_value.select.return_value.in_.return_value.execute.side_effect = [
+        coords_response, names_response
+    ]
+    
+    db_manager = DatabaseManager()
+    
+    from models import Restaurant
+    same_location = Restaurant(**sample_restaurant_data)
+    same_name = Restaurant(name='Known Cafe', address='1 Known Road', latitude=1.3, longitude=103.9)
+    other_address = Restaurant(name='Known Cafe', address='2 Other Road', latitude=1.31, longitude=103.91)
+    new = Restaurant(name='New Place', address='3 New Road', latitude=1.32, longitude=103.92)
+    
+    exists = db_manager.check_restaurants_exist([same_location, same_name, other_address, new])
+    
+    assert exists == [True, True, False, False]
+    assert mock_client.table.return_value.select.return_value.in_.return_value.execute.call_count == 2
+
+@patch('database.create_client')
+def test_check_restaurants_exist_builds_valid_name_filter(mock_create_client, sample_restaurant_data):
+    """Test names with commas and parentheses are quoted once in the IN filter"""
+    sanitize_param = pytest.importorskip('postgrest.utils').sanitize_param
+    
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    in_ = mock_client.table.return_value.select.return_value.in_
+    in_.return_value.execute.return_value = Mock(data=[])
+    
+    db_manager = DatabaseManager()
+    
+    from models import Restaurant
+    restaurants = [
+        Restaurant(**{**sample_restaurant_data, 'name': name, 'latitude': 1.3 + i / 1000})
+        for i, name in enumerate(['Loving Hut', 'Sushi, Bar', 'Cafe (Orchard)'])
+    ]
+    
+    assert db_manager.check_restaurants_exist(restaurants) == [False, False, False]
+    
+    # Build the filter the same way postgrest-py's in_() does
+    (names,) = [call.args[1] for call in in_.call_args_list if call.args[0] == 'name']
+    assert f"({','.join(map(sanitize_param, names))})" == '("Cafe (Orchard)",Loving Hut,"Sushi, Bar")'
+
+@patch('database.create_client')
+def test_check_restaurants_exist_falls_back_per_row(mock_create_client, sample_restaurant_data):
+    """Test a failed batched lookup is re-checked row by row instead of reported as all new"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    mock_client.table.return_value.select.return_value.in_.return_value.execute.side_effect = Exception("URI too long")
+    
+    db_manager = DatabaseManager()
+    
+    from models import Restaurant
+    known = Restaurant(**sample_restaurant_data)
+    new = Restaurant(name='New Place', address='3 New Road', latitude=1.32, longitude=103.92)
+    
+    with patch.object(db_manager, 'check_restaurant_exists', side_effect=[True, False]) as per_row:
+        exists = db_manager.check_restaurants_exist([known, new])
+    
+    assert exists == [True, False]
+    assert per_row.call_count == 2
+
+@patch('database.INSERT_BATCH_SIZE', 2)
+@patch('database.create_client')
+def test_insert_restaurants_in_batches(mock_create_client, sample_restaurant_data):
+    """Test that inserts are split into INSERT_BATCH_SIZE requests"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    
+    # Each insert echoes back the rows it was given
+    mock_client.table.return_value.insert.side_effect = lambda rows: Mock(execute=Mock(return_value=Mock(data=rows)))
+    
+    db_manager = DatabaseManager()
+    
+    from models import Restaurant
+    restaurants = [
+        Restaurant(**{**sample_restaurant_data, 'name': f'Restaurant {i}', 'latitude': 1.3 + i / 1000})
+        for i in range(5)
+    ]
+    
+    success, inserted_count, skipped_count = db_manager.insert_restaurants(restaurants, skip_duplicates=False)
+    
+    assert success is True
+    assert inserted_count == 5
+    assert skipped_count == 0
+    assert [len(call.args[0]) for call in mock_client.table.return_value.insert.call_args_list] == [2, 2, 1]
+
+@patch('database.INSERT_BATCH_SIZE', 3)
+@patch('database.create_client')
+def test_insert_restaurants_retries_failed_batch_row_by_row(mock_create_client, sample_restaurant_data):
+    """Test a batch rejected for one duplicate row only skips that row"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    
+    def insert(rows):
+        if isinstance(rows, list) and len(rows) > 1:
+            return Mock(execute=Mock(side_effect=Exception("duplicate key value violates unique constraint")))
+        if rows['name'] == 'Restaurant 1':
+            return Mock(execute=Mock(side_effect=Exception("duplicate key value violates unique constraint")))
+        return Mock(execute=Mock(return_value=Mock(data=[rows])))
+    mock_client.table.return_value.insert.side_effect = insert
+    
+    db_manager = DatabaseManager()
+    
+    from models import Restaurant
+    restaurants = [
+        Restaurant(**{**sample_restaurant_data, 'name': f'Restaurant {i}', 'latitude': 1.3 + i / 1000})
+        for i in range(3)
+    ]
+    
+    success, inserted_count, skipped_count = db_manager.insert_restaurants(restaurants, skip_duplicates=False)
+    
+    assert success is True
+    assert inserted_count == 2
+    assert skipped_count == 1
+
+@patch('database.create_client')
+def test_get_restaurants_by_location_bounding_box_fallback(mock_create_client):
+    """Test the bounding-box fallback filters box corners by exact distance and sorts by it"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    mock_client.rpc.return_value.execute.side_effect = Exception("function restaurants_within does not exist")
+    
+    box_response = Mock()
+    box_response.data = [
+        {'id': 1, 'name': 'Corner', 'latitude': 1.3 + 0.0085, 'longitude': 103.8 + 0.0085},
+        {'id': 2, 'name': 'Far', 'latitude': 1.3 + 0.008, 'longitude': 103.8},
+        {'id': 3, 'name': 'Near', 'latitude': 1.3 + 0.001, 'longitude': 103.8},
+    ]
+    (mock_client.table.return_value.select.return_value
+        .gte.return_value.lte.return_value.gte.return_value.lte.return_value
+        .order.return_value.range.return_value.execute.return_value) = box_response
+    
+    db_manager = DatabaseManager()
+    nearby = db_manager.get_restaurants_by_location(1.3, 103.8, radius_km=1.0)
+    
+    assert [r['name'] for r in nearby] == ['Near', 'Far']
+    assert nearby[0]['distance_km'] < nearby[1]['distance_km'] <= 1.0
+
+@patch('database.create_client')
+def test_search_restaurants_falls_back_when_fts_is_empty(mock_create_client):
+    """Test an empty full-text result falls back to the ILIKE name match"""
+    mock_client = Mock()
+    mock_create_client.return_value = mock_client
+    mock_client.rpc.return_value.execute.return_value = Mock(data=[])
+    
+    name_match = [{'id': 1, 'name': 'VeganBurg'}]
+    mock_client.table.return_value.select.return_value.ilike.return_value.limit.return_value.execute.return_value = Mock(data=name_match)
+    
+    db_manager = DatabaseManager()
+    results = db_manager.search_restaurants('veganb', limit=10)
+    
+    assert results == name_match
+    mock_client.rpc.assert_called_once_with('search_restaurants_fts', {'q': 'veganb', 'lim': 10})
+    mock_client.table.return_value.select.return_value.ilike.assert_called_once_with('name', '%veganb%')
@@ -0,0 +1,29 @@
+"""
+Tests for the HappyCow searchmap URL generator
+"""
+import pytest
+from sectorscraper.url_generator import HappyCowURLGenerator
+
+def test_generate_sector_url():
+    """Test that sector URLs carry all parameters in the expected order"""
+    url_gen = HappyCowURLGenerator()
+    sector = {'name': 'Sector_1_1', 'lat_center': 1.225, 'lng_center': 103.625}
+
+    url = url_gen.generate_sector_url(sector)
+
+    assert url == (
+        "https://www.happycow.net/searchmap/?s=3&location=&lat=1.225&lng=103.625"
+        "&page=1&zoom=11&metric=mi&limit=81&order=default"
+    )
+    assert url_gen.validate_url(url) is True
+
+def test_generate_sector_url_parameters():
+    """Test that generated URLs round-trip through get_url_parameters"""
+    url_gen = HappyCowURLGenerator()
+    sector = {'name': 'Sector_3_4', 'lat_center': 1.325, 'lng_center': 103.775}
+
+    params = url_gen.get_url_parameters(url_gen.generate_sector_url(sector))
+
+    assert params['lat'] == '1.325'
+    assert params['lng'] == '103.775'
+    assert params['limit'] == '81'